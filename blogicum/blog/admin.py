@@ -1,10 +1,14 @@
 from django.contrib import admin
 
+from .counters import delete_comments
+from .forms import PostAdminForm
 from .models import Category, Location, Post, Comment
+from .routers import with_authors
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
+    form = PostAdminForm
     list_display = (
         'title',
         'text',
@@ -24,9 +28,14 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category', 'author', 'location')
     list_display_links = ('title',)
 
+    def get_changelist_form(self, request, **kwargs):
+        return super().get_changelist_form(
+            request, form=PostAdminForm, **kwargs)
+
 
 class PostInline(admin.StackedInline):
     model = Post
+    form = PostAdminForm
     extra = 0
 
 
@@ -67,6 +76,15 @@ class CommentAdmin(admin.ModelAdmin):
         'text',
         'author',
         'created_at')
+    # Авторов подгружает get_queryset: JOIN невозможен, если комментарии
+    # лежат в отдельной базе.
+    list_select_related = ()
+
+    def get_queryset(self, request):
+        return with_authors(super().get_queryset(request))
+
+    def delete_queryset(self, request, queryset):
+        delete_comments(queryset)
 
 
 admin.site.empty_value_display = 'Не задано'
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management.base import CommandError
+from django.db import connections
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(call, requests, threads):
+    """Выполняет call() requests раз в threads потоках.
+
+    call возвращает False или бросает исключение при ошибке. Результат —
+    словарь с числом ошибок, запросами в секунду и задержками p50 и p99
+    в миллисекундах.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(count):
+        try:
+            for _ in range(count):
+                started = time.perf_counter()
+                try:
+                    ok = call() is not False
+                except Exception:
+                    ok = False
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if not ok:
+                        errors.append(elapsed)
+        finally:
+            connections.close_all()
+
+    shares = [requests // threads + (index < requests % threads)
+              for index in range(threads)]
+    workers = [threading.Thread(target=worker, args=(share,))
+               for share in shares]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    seconds = time.perf_counter() - started
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput': len(latencies) / seconds if seconds else 0,
+        'p50': percentile(latencies, 0.5) * 1000,
+        'p99': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def format_result(label, result):
+    return (
+        f'{label}: {result["throughput"]:.0f} запр./с, '
+        f'p50 {result["p50"]:.1f} мс, p99 {result["p99"]:.1f} мс, '
+        f'ошибок {result["errors"]} из {result["requests"]}'
+    )
+
+
+@contextmanager
+def scratch_copy(alias, **options):
+    """Подменяет базу alias её копией во временном каталоге.
+
+    options дополняют OPTIONS копии. Нужен файл SQLite: замеры пишут
+    в базу, а рабочую базу трогать нельзя.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+        raise CommandError('Замеры выполняются только на файле SQLite.')
+    settings_dict = connections.databases[alias]
+    saved = settings_dict['NAME'], settings_dict['OPTIONS']
+    with TemporaryDirectory() as directory:
+        copy = Path(directory) / 'benchmark.sqlite3'
+        source = sqlite3.connect(saved[0])
+        target = sqlite3.connect(copy)
+        with source, target:
+            source.backup(target)
+        source.close()
+        target.close()
+        connections.close_all()
+        settings_dict['NAME'] = copy
+        settings_dict['OPTIONS'] = {**saved[1], **options}
+        try:
+            yield copy
+        finally:
+            connections.close_all()
+            settings_dict['NAME'], settings_dict['OPTIONS'] = saved
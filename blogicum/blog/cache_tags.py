@@ -0,0 +1,67 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+GLOBAL_TAG = 'all'
+
+
+def _tag_key(tag):
+    return f'cache_tag:{tag}'
+
+
+def _raw_versions(tags):
+    # Версия тега — время его последнего сброса в наносекундах. Тег,
+    # вытесненный из кэша, получает новую версию, а не возвращается
+    # к старой, поэтому устаревшие страницы и ETag не оживают.
+    keys = {tag: _tag_key(tag) for tag in (GLOBAL_TAG, *tags)}
+    versions = cache.get_many(keys.values())
+    missing = {
+        key: time.time_ns() for key in keys.values() if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {tag: versions[key] for tag, key in keys.items()}
+
+
+def tag_versions(tags):
+    """Возвращает версии тегов одним запросом к кэшу.
+
+    Версия каждого тега включает версию GLOBAL_TAG, поэтому
+    invalidate(GLOBAL_TAG) сбрасывает всё, что построено на тегах.
+    """
+    tags = list(tags)
+    versions = _raw_versions(tags)
+    generation = versions.pop(GLOBAL_TAG)
+    return {
+        tag: f'{generation}.{version}' for tag, version in versions.items()
+    } or {GLOBAL_TAG: str(generation)}
+
+
+def tags_changed_at(tags):
+    """Время последнего сброса любого из тегов, в секундах."""
+    return max(_raw_versions(list(tags)).values()) // 10 ** 9
+
+
+def invalidate(*tags):
+    cache.set_many({_tag_key(tag): time.time_ns() for tag in tags}, None)
+
+
+def invalidate_now_and_on_commit(*tags, using=None):
+    # Сразу — чтобы автор изменения увидел его, после фиксации — чтобы
+    # выбросить то, что параллельный запрос успел закэшировать до неё.
+    invalidate(*tags)
+    transaction.on_commit(lambda: invalidate(*tags), using=using)
+
+
+def invalidate_post_pages(posts, *tags):
+    tags = {'index', *tags}
+    for post_id, slug, username in posts.values_list(
+            'pk', 'category__slug', 'author__username'):
+        tags.update((
+            f'post:{post_id}',
+            f'category:{slug}',
+            f'profile:{username}',
+        ))
+    invalidate_now_and_on_commit(*tags)
@@ -0,0 +1,120 @@
+import logging
+
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+from .routers import comments_are_separate
+
+logger = logging.getLogger(__name__)
+
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _templates_cached():
+    return all(
+        any(isinstance(loader, CachedLoader)
+            for loader in engine.engine.template_loaders)
+        for engine in engines.all()
+        if hasattr(engine, 'engine')
+    )
+
+
+def optimizations():
+    """Список (название, включена ли, как включить) оптимизаций проекта."""
+    database = settings.DATABASES['default']
+    return [
+        ('Постоянные соединения с БД или пул',
+         bool(database.get('CONN_MAX_AGE'))
+         or 'pool' in database.get('OPTIONS', {}),
+         'задайте CONN_MAX_AGE больше нуля'),
+        ('Кэш скомпилированных шаблонов',
+         _templates_cached(),
+         'включите django.template.loaders.cached.Loader'),
+        ('Общий для процессов кэш',
+         settings.CACHES['default']['BACKEND'] not in LOCAL_CACHES,
+         'задайте BLOGICUM_CACHE_URL: file://, db:// или memcached://'),
+        ('Кэш страниц',
+         bool(settings.PAGE_CACHE_TIMEOUT),
+         'задайте PAGE_CACHE_TIMEOUT больше нуля'),
+        ('Кэш фрагментов',
+         bool(settings.FRAGMENT_CACHE_TIMEOUT),
+         'задайте FRAGMENT_CACHE_TIMEOUT больше нуля'),
+        ('Кэш результатов запросов',
+         bool(settings.QUERY_CACHE_TIMEOUT),
+         'задайте QUERY_CACHE_TIMEOUT больше нуля'),
+        ('Сессии в кэше',
+         settings.SESSION_ENGINE.startswith(
+             'django.contrib.sessions.backends.cache'),
+         'задайте SESSION_ENGINE = ...sessions.backends.cached_db'),
+        ('Курсорная пагинация лент',
+         settings.POSTS_PAGINATION == 'cursor',
+         "задайте POSTS_PAGINATION = 'cursor'"),
+        ('Планировщик отложенных публикаций',
+         settings.PUBLICATION_SCHEDULER,
+         'задайте PUBLICATION_SCHEDULER = True и запустите '
+         'manage.py publish_scheduled --loop'),
+        ('Фоновые задачи вне запроса',
+         settings.JOBS_MODE != 'immediate',
+         "задайте JOBS_MODE = 'database' и запустите "
+         'manage.py run_jobs --loop'),
+        ('Отправка писем в фоне',
+         settings.EMAIL_BACKEND == 'jobs.mail.QueuedEmailBackend',
+         'задайте EMAIL_BACKEND = jobs.mail.QueuedEmailBackend'),
+        ('Отдача медиа фронтовым сервером',
+         bool(settings.MEDIA_ACCEL),
+         "задайте BLOGICUM_MEDIA_ACCEL: 'x-accel-redirect' "
+         "или 'x-sendfile'"),
+        ('Статика с хэшами и сжатыми копиями',
+         'Manifest' in settings.STATICFILES_STORAGE,
+         'задайте STATICFILES_STORAGE = '
+         'blogicum.storage.CompressedManifestStaticFilesStorage'),
+        ('DEBUG выключен',
+         not settings.DEBUG,
+         'задайте DEBUG = False'),
+        ('debug_toolbar не подключён',
+         'debug_toolbar' not in settings.INSTALLED_APPS,
+         'уберите debug_toolbar из INSTALLED_APPS'),
+    ]
+
+
+@register('performance')
+def check_optimizations(app_configs, **kwargs):
+    """В prod предупреждает о каждой выключенной оптимизации."""
+    if getattr(settings, 'PROFILE', None) != 'prod':
+        return []
+    return [
+        Warning(f'Выключено: {name}', hint=hint, id=f'blog.W{number:03d}')
+        for number, (name, enabled, hint) in enumerate(optimizations(), 1)
+        if not enabled
+    ]
+
+
+@register()
+def check_comments_database(app_configs, **kwargs):
+    """Отдельная база комментариев не может ссылаться на основную."""
+    if not comments_are_separate():
+        return []
+    database = settings.DATABASES.get(settings.COMMENTS_DATABASE, {})
+    if database.get('OPTIONS', {}).get('foreign_keys') is False:
+        return []
+    return [Error(
+        'База комментариев создаётся с внешними ключами на таблицы '
+        'основной базы',
+        hint=f"задайте OPTIONS['foreign_keys'] = False для базы "
+             f"{settings.COMMENTS_DATABASE!r}",
+        id='blog.E001',
+    )]
+
+
+def log_optimizations():
+    """Пишет в журнал, какие оптимизации включены; вызывается при старте."""
+    for name, enabled, hint in optimizations():
+        if enabled:
+            logger.info('[вкл]  %s', name)
+        else:
+            logger.info('[выкл] %s: %s', name, hint)
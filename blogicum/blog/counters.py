@@ -0,0 +1,160 @@
+from collections import Counter
+
+from django.db import connections, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .cache_tags import invalidate_post_pages
+from .models import Comment, Post
+from .routers import comments_are_separate
+
+
+def actual_comment_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        ),
+        Value(0),
+    )
+
+
+def change_comment_count(post_id, delta):
+    if post_id is not None:
+        Post.objects.filter(pk=post_id).update(
+            comment_count=F('comment_count') + delta
+        )
+
+
+def change_comment_count_with(comment, delta, post_id=None):
+    """Меняет счётчик вместе с записью комментария.
+
+    post_id — публикация, если не та, к которой комментарий относится
+    сейчас. Если комментарии лежат в своей базе, счётчик меняется после
+    фиксации их транзакции: откат не оставит лишней единицы.
+    """
+    if post_id is None:
+        post_id = comment.post_id
+    if not comments_are_separate():
+        change_comment_count(post_id, delta)
+    else:
+        transaction.on_commit(
+            lambda: change_comment_count(post_id, delta),
+            using=comment._state.db,
+        )
+
+
+class _Deleting:
+    """Публикации и комментарии, удаляемые в текущей транзакции.
+
+    Хранится среди обработчиков on_commit базы публикаций: откат
+    транзакции отбрасывает его вместе с пометками.
+    """
+
+    def __init__(self):
+        self.posts = set()
+        self.comments = set()
+
+    def __call__(self):
+        pass
+
+
+def _deleting(create=False):
+    connection = connections[router.db_for_write(Post)]
+    for _, hook in connection.run_on_commit:
+        if isinstance(hook, _Deleting):
+            return hook
+    if create and connection.in_atomic_block:
+        hook = _Deleting()
+        transaction.on_commit(hook, using=connection.alias)
+        return hook
+    return None
+
+
+def mark_posts_deleted(*post_ids):
+    """Комментарии этих публикаций удаляются вместе с ними."""
+    deleting = _deleting(create=True)
+    if deleting is not None:
+        deleting.posts.update(post_ids)
+
+
+def comment_count_handled(comment):
+    """Удаление комментария уже учтено пачкой или вместе с публикацией."""
+    deleting = _deleting()
+    return deleting is not None and (
+        comment.post_id in deleting.posts or comment.pk in deleting.comments
+    )
+
+
+def delete_comments(comments):
+    """Удаляет комментарии с одним UPDATE счётчика на публикацию.
+
+    Страницы затронутых публикаций тоже сбрасываются по разу, а не
+    по каждому комментарию.
+    """
+    with transaction.atomic(using=router.db_for_write(Post)):
+        deleting = _deleting(create=True)
+        rows = list(comments.values_list('pk', 'post_id'))
+        deleting.comments.update(pk for pk, _ in rows)
+        removed = Counter(
+            post_id for _, post_id in rows
+            if post_id is not None and post_id not in deleting.posts
+        )
+        # Комментарии, появившиеся после выборки, учтёт comment_deleted.
+        comments.delete()
+        for post_id, count in removed.items():
+            change_comment_count(post_id, -count)
+        if removed:
+            invalidate_post_pages(
+                Post.objects.filter(pk__in=removed),
+                *(f'thread:{post_id}' for post_id in removed),
+            )
+
+
+def _fix_batch_across_databases(first_id, last_id):
+    actual = dict(
+        Comment.objects.filter(post_id__gte=first_id, post_id__lte=last_id)
+        .order_by()
+        .values_list('post')
+        .annotate(total=Count('pk'))
+    )
+    stored = Post.objects.filter(
+        pk__gte=first_id, pk__lte=last_id
+    ).values_list('pk', 'comment_count')
+    fixed = 0
+    for pk, count in stored:
+        if count != actual.get(pk, 0):
+            fixed += Post.objects.filter(pk=pk).update(
+                comment_count=actual.get(pk, 0)
+            )
+    return fixed
+
+
+def recount_comments(posts=None, batch_size=10000):
+    """Исправляет расхождения comment_count пачками по диапазонам id.
+
+    Если комментарии лежат в своей базе, вместо подзапроса по каждой
+    пачке считаются комментарии и сравниваются с сохранёнными
+    значениями. Возвращает число исправленных публикаций.
+    """
+    posts = (Post.objects.all() if posts is None else posts).order_by()
+    ids = posts.values_list('pk', flat=True).order_by('pk')
+    fixed = 0
+    last_id = 0
+    while True:
+        batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+        if not batch:
+            return fixed
+        last_id = batch[-1]
+        if comments_are_separate():
+            fixed += _fix_batch_across_databases(batch[0], last_id)
+            continue
+        fixed += (
+            Post.objects.filter(pk__gte=batch[0], pk__lte=last_id)
+            .annotate(actual=actual_comment_count())
+            .exclude(comment_count=F('actual'))
+            .update(comment_count=actual_comment_count())
+        )
@@ -3,7 +3,19 @@ from django import forms
 from .models import Post, Comment, User
 
 
-class PostForm(forms.ModelForm):
+class FreshPostFieldsMixin:
+    """Перечитывает Post.BACKGROUND_FIELDS перед сохранением формы.
+
+    Иначе форма записала бы их значения на момент загрузки публикации.
+    """
+
+    def save(self, commit=True):
+        if commit and not self.instance._state.adding:
+            self.instance.refresh_from_db(fields=Post.BACKGROUND_FIELDS)
+        return super().save(commit)
+
+
+class PostForm(FreshPostFieldsMixin, forms.ModelForm):
 
     class Meta():
         model = Post
@@ -13,6 +25,13 @@ class PostForm(forms.ModelForm):
         }
 
 
+class PostAdminForm(FreshPostFieldsMixin, forms.ModelForm):
+
+    class Meta():
+        model = Post
+        fields = '__all__'
+
+
 class CommentForm(forms.ModelForm):
 
     class Meta():
@@ -0,0 +1,224 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+try:
+    # Pillow умеет AVIF только с этим плагином.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+VARIANTS_DIR = 'post_images/variants'
+FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+MODERN_FORMATS = {'avif': 'AVIF', 'webp': 'WEBP'}
+
+
+def modern_formats():
+    """Форматы из POST_IMAGE_FORMATS, которые умеет сохранять Pillow."""
+    Image.init()
+    return [
+        extension for extension in settings.POST_IMAGE_FORMATS
+        if MODERN_FORMATS[extension] in Image.SAVE
+    ]
+
+
+def modern_name(name, extension):
+    return f'{name}.{extension}'
+
+
+def delete_image_file(storage, name):
+    storage.delete(name)
+    for extension in MODERN_FORMATS:
+        storage.delete(modern_name(name, extension))
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        image.convert('RGB').save(
+            buffer, 'JPEG', quality=settings.POST_IMAGE_QUALITY,
+            optimize=True, progressive=True)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    return buffer.getvalue()
+
+
+def build_image_variants(image_field):
+    """Строит уменьшенные копии изображения публикации.
+
+    Возвращает описание для Post.image_variants: имя и размеры оригинала
+    и список копий шириной из POST_IMAGE_WIDTHS, меньших оригинала.
+    """
+    storage = image_field.storage
+    with image_field.open('rb') as file, Image.open(file) as original:
+        image_format = original.format
+        if image_format not in FORMATS:
+            image_format = 'JPEG'
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        # Имя оригинала в хранилище уникально (вместе с суффиксом, который
+        # добавляет хранилище), поэтому копии разных фото не совпадают.
+        source = PurePosixPath(image_field.name).name
+        sizes = []
+        for target in sorted(settings.POST_IMAGE_WIDTHS):
+            if target >= width:
+                break
+            target_height = max(1, round(height * target / width))
+            resized = image.resize((target, target_height), Image.LANCZOS)
+            name = (
+                f'{VARIANTS_DIR}/{source}-{target}w.{FORMATS[image_format]}'
+            )
+            name = storage.save(
+                name, ContentFile(_encode(resized, image_format))
+            )
+            sizes.append(
+                {'name': name, 'width': target, 'height': target_height}
+            )
+    return {
+        'name': image_field.name,
+        'width': width,
+        'height': height,
+        'sizes': sizes,
+    }
+
+
+def delete_image_variants(variants, storage):
+    for size in variants.get('sizes', ()):
+        delete_image_file(storage, size['name'])
+    if variants.get('name'):
+        for extension in MODERN_FORMATS:
+            storage.delete(modern_name(variants['name'], extension))
+
+
+def image_file_names(post):
+    """Оригинал и уменьшенные копии фото публикации."""
+    if not post.image:
+        return []
+    variants = post.image_variants or {}
+    return [post.image.name] + [
+        size['name'] for size in variants.get('sizes', ())
+        if variants.get('name') == post.image.name
+    ]
+
+
+def build_modern_image(storage, name, extension, force=False):
+    """Сохраняет рядом с файлом его копию в формате extension.
+
+    Возвращает размеры исходника и копии в байтах. Копия, которая вышла
+    не меньше исходника, не сохраняется, и вместо её размера — None.
+    """
+    target = modern_name(name, extension)
+    source_size = storage.size(name)
+    if not force and storage.exists(target):
+        return source_size, storage.size(target)
+    storage.delete(target)
+    with storage.open(name, 'rb') as file, Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert(
+                'RGBA' if 'transparency' in image.info
+                or image.mode in ('LA', 'PA') else 'RGB'
+            )
+        buffer = BytesIO()
+        image.save(
+            buffer, MODERN_FORMATS[extension],
+            quality=settings.POST_IMAGE_QUALITY,
+        )
+    if buffer.tell() >= source_size:
+        return source_size, None
+    storage.save(target, ContentFile(buffer.getvalue()))
+    return source_size, buffer.tell()
+
+
+def accepted_types(accept):
+    """Типы из заголовка Accept, которые клиент принимает (q > 0)."""
+    types = set()
+    for media_range in accept.split(','):
+        media_type, *params = media_range.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            types.add(media_type.strip().lower())
+    return types
+
+
+def negotiate_image(storage, name, accept):
+    """Лучшая из готовых копий файла, которую принимает клиент.
+
+    Возвращает имя файла: копию в современном формате из заголовка
+    Accept, если она есть в хранилище, иначе сам name.
+    """
+    if not name.startswith('post_images/'):
+        return name
+    types = accepted_types(accept)
+    for extension in settings.POST_IMAGE_FORMATS:
+        candidate = modern_name(name, extension)
+        if f'image/{extension}' in types and storage.exists(candidate):
+            return candidate
+    return name
+
+
+def refresh_image_variants(post, force=False):
+    """Пересобирает копии, если изображение публикации сменилось.
+
+    Сохраняет описание через UPDATE, не вызывая сигналы модели;
+    возвращает True, если описание изменилось.
+    """
+    current = post.image_variants or {}
+    if not force and current.get('name', '') == post.image.name:
+        return False
+    delete_image_variants(current, post.image.storage)
+    post.image_variants = (
+        build_image_variants(post.image) if post.image else {}
+    )
+    type(post).objects.filter(pk=post.pk).update(
+        image_variants=post.image_variants
+    )
+    return True
+
+
+class ResponsiveImage:
+    """Данные для <img> карточки без обращения к файлам."""
+
+    def __init__(self, image_field, variants):
+        self.image_field = image_field
+        self.variants = variants if (
+            variants.get('name') == image_field.name) else {}
+
+    @property
+    def width(self):
+        return self.variants.get('width')
+
+    @property
+    def height(self):
+        return self.variants.get('height')
+
+    def _candidates(self):
+        storage = self.image_field.storage
+        for size in self.variants.get('sizes', ()):
+            yield storage.url(size['name']), size['width']
+        if self.width:
+            yield self.image_field.url, self.width
+
+    @property
+    def src(self):
+        for url, width in self._candidates():
+            if width >= settings.POST_IMAGE_DEFAULT_WIDTH:
+                return url
+        return self.image_field.url
+
+    @property
+    def srcset(self):
+        candidates = list(self._candidates())
+        if len(candidates) < 2:
+            return ''
+        return ', '.join(f'{url} {width}w' for url, width in candidates)
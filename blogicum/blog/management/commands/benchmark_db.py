@@ -0,0 +1,99 @@
+import itertools
+import logging
+import threading
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from blog.benchmark import format_result, measure, scratch_copy
+from blog.models import Post
+from blog.routers import comments_are_separate
+from blogicum.backends.sqlite3.base import SQLITE_DEFAULTS
+from blogicum.write_queue import stop_writers
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность ленты и комментариев '
+        'на копии базы с PRAGMA SQLite по умолчанию и из настроек, '
+        'без очереди записи и с ней.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Запросов на каждый сценарий.')
+        parser.add_argument(
+            '--threads', type=int, default=8,
+            help='Одновременных потоков.')
+
+    def handle(self, *args, **options):
+        configured = connections[DEFAULT_DB_ALIAS].settings_dict['OPTIONS']
+        modes = (
+            ('по умолчанию', {'pragmas': SQLITE_DEFAULTS,
+                              'transaction_mode': None}),
+            ('из настроек', configured),
+        )
+        aliases = [DEFAULT_DB_ALIAS]
+        if comments_are_separate():
+            aliases.append(settings.COMMENTS_DATABASE)
+        # Ошибки считаются в отчёте, трассировки каждой 500 не нужны.
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+        try:
+            with override_settings(ALLOWED_HOSTS=['*']):
+                for (label, mode), queued in itertools.product(
+                        modes, (False, True)):
+                    with ExitStack() as stack:
+                        for alias in aliases:
+                            stack.enter_context(scratch_copy(alias, **mode))
+                        stack.enter_context(
+                            override_settings(WRITE_QUEUE=queued))
+                        # Потоки записи держат соединения с копиями.
+                        stack.callback(stop_writers)
+                        queue = ', очередь записи' if queued else ''
+                        self.stdout.write(f'PRAGMA {label}{queue}:')
+                        self.run_scenarios(options)
+        finally:
+            request_logger.disabled = False
+
+    def run_scenarios(self, options):
+        post = Post.objects.filter(is_visible=True).first()
+        if post is None:
+            raise CommandError('Для замеров нужна опубликованная запись.')
+        user = get_user_model().objects.create_user('benchmark_db')
+        login = Client()
+        login.force_login(user)
+        session = login.cookies[settings.SESSION_COOKIE_NAME].value
+        feed_url = reverse('blog:index')
+        comment_url = reverse('blog:add_comment', args=(post.pk,))
+        local = threading.local()
+
+        def client():
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+                local.client.cookies[settings.SESSION_COOKIE_NAME] = session
+            return local.client
+
+        def feed():
+            return client().get(feed_url).status_code < 400
+
+        def comment():
+            return client().post(
+                comment_url, {'text': 'benchmark'}).status_code < 400
+
+        turns = itertools.cycle((feed, comment))
+
+        def mixed():
+            return next(turns)()
+
+        for name, call in (
+                ('лента', feed), ('комментарии', comment),
+                ('лента и комментарии', mixed)):
+            result = measure(call, options['requests'], options['threads'])
+            self.stdout.write('  ' + format_result(name, result))
@@ -0,0 +1,48 @@
+import os
+from itertools import repeat
+
+from django.core.management.base import BaseCommand
+
+from blog.cache_tags import invalidate_post_pages
+from blog.images import refresh_image_variants
+from blog.models import Post
+from blog.parallel import map_in_processes
+
+
+def refresh_post(post_id, force):
+    post = Post.objects.get(pk=post_id)
+    try:
+        return post_id, refresh_image_variants(post, force=force), None
+    except OSError as error:
+        return post_id, False, str(error)
+
+
+class Command(BaseCommand):
+    help = 'Строит уменьшенные копии фото публикаций, загруженных ранее.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Сколько процессов обрабатывают фото; 1 — без пула.')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересобрать копии и для уже обработанных фото.')
+
+    def handle(self, *args, **options):
+        post_ids = list(
+            Post.objects.exclude(image='').values_list('pk', flat=True)
+        )
+        results = map_in_processes(
+            refresh_post, post_ids, repeat(options['force']),
+            workers=options['workers'],
+        )
+
+        changed = [post_id for post_id, built, _ in results if built]
+        for post_id, _, error in results:
+            if error:
+                self.stderr.write(f'Публикация {post_id}: {error}')
+        if changed:
+            invalidate_post_pages(Post.objects.filter(pk__in=changed))
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано фото: {len(changed)} из {len(post_ids)}'
+        ))
@@ -0,0 +1,76 @@
+import os
+from collections import defaultdict
+from itertools import repeat
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.images import build_modern_image, image_file_names, modern_formats
+from blog.models import Post
+from blog.parallel import map_in_processes
+
+
+def convert_file(name, extensions, force):
+    results = []
+    for extension in extensions:
+        try:
+            source_size, size = build_modern_image(
+                default_storage, name, extension, force=force)
+        except OSError as error:
+            return name, results, str(error)
+        results.append((extension, source_size, size))
+    return name, results, None
+
+
+class Command(BaseCommand):
+    help = (
+        'Сохраняет фото публикаций и их копии в форматах '
+        'POST_IMAGE_FORMATS и печатает, сколько байт это экономит.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Сколько процессов кодируют фото; 1 — без пула.')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Пересобрать уже сохранённые копии.')
+
+    def handle(self, *args, **options):
+        extensions = modern_formats()
+        if not extensions:
+            raise CommandError(
+                'Pillow не умеет сохранять ни один формат из '
+                'POST_IMAGE_FORMATS.'
+            )
+        names = [
+            name
+            for post in Post.objects.exclude(image='').only(
+                'image', 'image_variants')
+            for name in image_file_names(post)
+        ]
+        results = map_in_processes(
+            convert_file, names, repeat(extensions),
+            repeat(options['force']), workers=options['workers'],
+        )
+
+        totals = defaultdict(lambda: [0, 0, 0])
+        for name, converted, error in results:
+            if error:
+                self.stderr.write(f'{name}: {error}')
+            for extension, source_size, size in converted:
+                total = totals[extension]
+                total[0] += source_size
+                total[1] += source_size if size is None else size
+                total[2] += size is not None
+
+        self.stdout.write(f'Файлов: {len(names)}')
+        for extension in extensions:
+            source_bytes, served_bytes, files = totals[extension]
+            saved = source_bytes - served_bytes
+            percent = saved * 100 / source_bytes if source_bytes else 0
+            self.stdout.write(
+                f'{extension.upper()}: копий {files}, '
+                f'{source_bytes} → {served_bytes} байт, '
+                f'экономия {saved} байт ({percent:.1f}%)'
+            )
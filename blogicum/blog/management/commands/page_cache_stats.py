@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.page_cache import page_cache_stats
+
+NAMESPACES = ('index', 'category', 'profile', 'pages')
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша страниц.'
+
+    def handle(self, *args, **options):
+        for namespace, stats in page_cache_stats(NAMESPACES).items():
+            total = stats['hit'] + stats['miss']
+            ratio = stats['hit'] / total if total else 0
+            self.stdout.write(
+                f'{namespace}: попаданий {stats["hit"]}, '
+                f'промахов {stats["miss"]}, доля попаданий {ratio:.0%}'
+            )
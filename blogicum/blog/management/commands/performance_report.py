@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.checks import optimizations
+
+
+class Command(BaseCommand):
+    help = 'Показывает, какие оптимизации включены в текущем профиле.'
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Профиль: {getattr(settings, "PROFILE", "?")}')
+        for name, enabled, hint in optimizations():
+            if enabled:
+                self.stdout.write(self.style.SUCCESS(f'[вкл]  {name}'))
+            else:
+                self.stdout.write(f'[выкл] {name}: {hint}')
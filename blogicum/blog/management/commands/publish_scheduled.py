@@ -0,0 +1,58 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.publication import publish_due_posts
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+DEFAULT_LOCK_FILE = Path(tempfile.gettempdir()) / 'blogicum-publish.lock'
+
+
+@contextmanager
+def local_lock(path):
+    with open(path, 'a+') as lock_file:
+        try:
+            if os.name == 'nt':
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            raise CommandError(
+                f'Планировщик уже запущен (блокировка {path}).'
+            )
+        yield
+
+
+class Command(BaseCommand):
+    help = 'Выпускает в ленту отложенные публикации, время которых пришло.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя публикации каждые --interval.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между проверками в секундах.')
+        parser.add_argument(
+            '--lock-file', default=DEFAULT_LOCK_FILE,
+            help='Файл блокировки, не дающий запустить второй планировщик.')
+
+    def handle(self, *args, **options):
+        with local_lock(options['lock_file']):
+            while True:
+                post_ids = publish_due_posts()
+                if post_ids:
+                    self.stdout.write(
+                        f'Опубликовано: {len(post_ids)}'
+                    )
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.query_cache import query_cache_stats
+
+NAMES = (
+    'user', 'category', 'index_posts', 'category_posts', 'profile_posts',
+)
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша результатов запросов.'
+
+    def handle(self, *args, **options):
+        for name, stats in query_cache_stats(NAMES).items():
+            total = stats['hit'] + stats['miss']
+            ratio = stats['hit'] / total if total else 0
+            self.stdout.write(
+                f'{name}: попаданий {stats["hit"]}, '
+                f'промахов {stats["miss"]}, доля попаданий {ratio:.0%}'
+            )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Сколько публикаций проверять за один UPDATE.')
+
+    def handle(self, *args, **options):
+        fixed = recount_comments(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлено публикаций: {fixed}'
+        ))
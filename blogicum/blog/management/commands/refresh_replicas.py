@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blogicum.replicas import refresh_snapshot
+
+
+def snapshot_replicas():
+    """Пары (реплика, источник) для баз с OPTIONS['snapshot_of']."""
+    return [
+        (alias, connections.databases[alias]['OPTIONS']['snapshot_of'])
+        for alias in connections
+        if connections.databases[alias]['OPTIONS'].get('snapshot_of')
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Обновляет реплики SQLite копией основной базы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, обновляя копии каждые --interval.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между обновлениями в секундах; вместе со временем '
+                 'копирования не должна превышать REPLICA_LAG_SECONDS.')
+
+    def handle(self, *args, **options):
+        replicas = snapshot_replicas()
+        if not replicas:
+            self.stdout.write('Реплик SQLite нет: задайте '
+                              'BLOGICUM_SQLITE_REPLICA=1.')
+            return
+        while True:
+            for alias, source in replicas:
+                started = time.monotonic()
+                refresh_snapshot(
+                    connections.databases[source]['NAME'],
+                    connections.databases[alias]['NAME'],
+                )
+                if options['verbosity'] > 1 or not options['loop']:
+                    self.stdout.write(
+                        f'{alias}: копия {source} за '
+                        f'{time.monotonic() - started:.2f} с'
+                    )
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
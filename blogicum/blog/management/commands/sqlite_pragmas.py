@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blogicum.backends.sqlite3.base import read_pragmas
+
+
+class Command(BaseCommand):
+    help = 'Показывает действующие PRAGMA соединений с SQLite.'
+
+    def handle(self, *args, **options):
+        for alias in connections:
+            connection = connections[alias]
+            if connection.vendor != 'sqlite':
+                continue
+            configured = connection.settings_dict['OPTIONS'].get(
+                'pragmas', {})
+            self.stdout.write(f'{alias}: {connection.settings_dict["NAME"]}')
+            for name, value in read_pragmas(connection).items():
+                line = f'  {name} = {value}'
+                if name in configured:
+                    line += f' (задано {configured[name]})'
+                self.stdout.write(line)
@@ -0,0 +1,40 @@
+import base64
+import hashlib
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def subresource_integrity(data, algorithm):
+    digest = hashlib.new(algorithm, data).digest()
+    return f'{algorithm}-{base64.b64encode(digest).decode()}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Скачивает сторонние файлы статики из VENDOR_ASSETS в static_dev '
+        'и сверяет их SRI-хэши.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Ничего не скачивать, только сверить уже лежащие файлы.')
+
+    def handle(self, *args, **options):
+        root = settings.STATICFILES_DIRS[0]
+        for url, integrity, target in settings.VENDOR_ASSETS:
+            path = root / target
+            if options['check']:
+                data = path.read_bytes()
+            else:
+                with urlopen(url, timeout=30) as response:
+                    data = response.read()
+            algorithm = integrity.split('-', 1)[0]
+            if subresource_integrity(data, algorithm) != integrity:
+                raise CommandError(f'{target}: SRI-хэш не совпадает.')
+            if not options['check']:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(data)
+            self.stdout.write(f'{target}: {integrity}')
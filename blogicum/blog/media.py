@@ -0,0 +1,188 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .images import negotiate_image
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def parse_range(header, size):
+    """Диапазон (start, end) включительно из заголовка Range.
+
+    None — заголовка нет или он не поддерживается (несколько диапазонов,
+    другие единицы), и отдаётся весь файл; ValueError — диапазон
+    не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        length = int(end)
+        if not length:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _file_response(request, path, size, etag):
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and if_range in (None, etag):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = open(path, 'rb')
+    if byte_range is None:
+        # Через wsgi.file_wrapper сервер отдаёт файл sendfile'ом.
+        return FileResponse(file)
+    start, end = byte_range
+    if end == size - 1:
+        file.seek(start)
+        response = FileResponse(file, status=206)
+    else:
+        response = StreamingHttpResponse(
+            _read_range(file, start, end - start + 1), status=206
+        )
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def _accel_response(path, name):
+    response = HttpResponse()
+    if settings.MEDIA_ACCEL == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(name)
+        )
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def serve_file(request, root, name, content_type=None, accel=False):
+    """Отдаёт файл name из каталога root.
+
+    Отвечает 304 на условные запросы и 206 на Range. При accel=True
+    и заданном MEDIA_ACCEL байты отдаёт фронтовой сервер по заголовку
+    X-Accel-Redirect или X-Sendfile.
+    """
+    try:
+        full_path = safe_join(root, name)
+        stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404('Файл не найден')
+    if not os.path.isfile(full_path):
+        raise Http404('Файл не найден')
+
+    etag = quote_etag(f'{stat.st_size:x}-{stat.st_mtime_ns:x}')
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if accel and settings.MEDIA_ACCEL:
+            response = _accel_response(full_path, name)
+        else:
+            response = _file_response(request, full_path, stat.st_size, etag)
+        response['Accept-Ranges'] = 'bytes'
+        response['Last-Modified'] = http_date(last_modified)
+        if content_type is None:
+            content_type, encoding = mimetypes.guess_type(name)
+            if encoding:
+                content_type = None
+        response['Content-Type'] = content_type or 'application/octet-stream'
+    response['ETag'] = etag
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Отдаёт загруженный файл, выбирая формат фото по заголовку Accept."""
+    name = negotiate_image(
+        default_storage, path, request.headers.get('Accept', '')
+    )
+    response = serve_file(request, settings.MEDIA_ROOT, name, accel=True)
+    patch_cache_control(
+        response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
+    if path.startswith('post_images/'):
+        patch_vary_headers(response, ('Accept',))
+    return response
+
+
+@require_safe
+def serve_static(request, path):
+    """Отдаёт собранную статику, предпочитая сжатые копии .br и .gz.
+
+    Файлы с хэшем содержимого в имени кэшируются навсегда (immutable).
+    """
+    accepted = request.headers.get('Accept-Encoding', '')
+    name, encoding = path, None
+    for candidate, suffix in STATIC_ENCODINGS:
+        if candidate in accepted and staticfiles_storage.exists(
+                path + suffix):
+            name, encoding = path + suffix, candidate
+            break
+    response = serve_file(
+        request, settings.STATIC_ROOT, name,
+        content_type=mimetypes.guess_type(path)[0],
+    )
+    if encoding and response.status_code != 304:
+        response['Content-Encoding'] = encoding
+    hashed_names = getattr(staticfiles_storage, 'hashed_files', {}).values()
+    if path in hashed_names:
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_CACHE_MAX_AGE
+        )
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
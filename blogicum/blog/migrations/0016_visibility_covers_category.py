@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:19
+
+from django.db import migrations, models
+
+
+def hide_posts_of_hidden_categories(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(is_visible=True).exclude(
+        category__is_published=True
+    ).update(is_visible=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            hide_posts_of_hidden_categories, migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_category_feed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date', '-id'], name='post_published_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['category', '-pub_date', '-id'], name='post_category_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_visibility_covers_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Размеры фото и уменьшенные копии'),
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+
+from .images import ResponsiveImage
 
 User = get_user_model()
 
@@ -47,6 +51,20 @@ class Location(BasePublishedModel):
         return self.name[:21]
 
 
+class PostQuerySet(models.QuerySet):
+
+    def refresh_visibility(self):
+        visible = models.Q(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lt=timezone.now())
+        return (
+            self.filter(visible, is_visible=False).update(is_visible=True)
+            + self.filter(is_visible=True).exclude(visible).update(
+                is_visible=False)
+        )
+
+
 class Post(BasePublishedModel):
 
     title = models.CharField(max_length=256, verbose_name='Заголовок')
@@ -77,6 +95,25 @@ class Post(BasePublishedModel):
         upload_to='post_images',
         blank=True,
         verbose_name='Фото')
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев')
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Вышла в ленту')
+    image_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Размеры фото и уменьшенные копии')
+
+    objects = PostQuerySet.as_manager()
+
+    # Поля, которые меняют UPDATE'ы сигналов комментариев и фоновых
+    # задач: у объекта, загруженного раньше, они могут устареть.
+    BACKGROUND_FIELDS = ('comment_count', 'image_variants')
 
     class Meta():
         verbose_name = 'публикация'
@@ -88,11 +125,48 @@ class Post(BasePublishedModel):
                 name='Unique post constraint',
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True, is_visible=False),
+                name='post_scheduled_idx',
+            ),
+        )
 
     def __str__(self):
         return (f'{self.title[:21]} {self.text[:21]} '
                 f'{self.category.title[:21]}')
 
+    def get_absolute_url(self):
+        return reverse('blog:post_detail', args=[self.pk])
+
+    @property
+    def responsive_image(self):
+        return ResponsiveImage(self.image, self.image_variants)
+
+    def save(self, *args, **kwargs):
+        self.is_visible = (
+            self.is_published
+            and self.pub_date < timezone.now()
+            and self.category is not None
+            and self.category.is_published
+        )
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField(max_length=256, verbose_name='Текст')
@@ -114,6 +188,12 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_thread_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:21]
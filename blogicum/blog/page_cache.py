@@ -0,0 +1,156 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from blogicum.replicas import use_primary_if_changed
+from .cache_tags import GLOBAL_TAG, tag_versions, tags_changed_at
+from .publication import publication_bucket
+
+STATS_KEY = 'page_cache:stats:{namespace}:{outcome}'
+
+
+def _count(namespace, outcome):
+    key = STATS_KEY.format(namespace=namespace, outcome=outcome)
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+def page_cache_stats(namespaces):
+    keys = {
+        (namespace, outcome): STATS_KEY.format(
+            namespace=namespace, outcome=outcome)
+        for namespace in namespaces
+        for outcome in ('hit', 'miss')
+    }
+    values = cache.get_many(keys.values())
+    return {
+        namespace: {
+            outcome: values.get(keys[namespace, outcome], 0)
+            for outcome in ('hit', 'miss')
+        }
+        for namespace in namespaces
+    }
+
+
+def _bucket():
+    # Без фонового планировщика отложенные публикации выпускает первое
+    # чтение ленты в корзине, поэтому корзина входит в ключи страниц.
+    return '' if settings.PUBLICATION_SCHEDULER else publication_bucket()
+
+
+def page_key(request, namespace, tags, params=()):
+    # Из параметров запроса в ключ входят только params: остальные
+    # страницу не меняют и не должны плодить записи в кэше.
+    versions = ':'.join(tag_versions(tags or (GLOBAL_TAG,)).values())
+    query = urlencode(sorted(
+        (name, value)
+        for name in params
+        for value in request.GET.getlist(name)
+    ))
+    path = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    return f'page_cache:page:{namespace}:{versions}:{_bucket()}:{path}'
+
+
+def page_etag(request, tags):
+    versions = ':'.join(tag_versions(tags or (GLOBAL_TAG,)).values())
+    viewer = ':'.join((
+        str(request.user.pk),
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ''),
+    ))
+    return hashlib.md5(
+        f'{request.get_full_path()}|{viewer}|{versions}|{_bucket()}'.encode()
+    ).hexdigest()
+
+
+class CachedPageMixin:
+    """Кэширует целую страницу для анонимных GET-запросов.
+
+    Ключ строится из пути с параметрами page_cache_params, корзины публикации
+    и версий тегов из get_cache_tags(); сигналы моделей увеличивают
+    версии тегов, и устаревшие страницы больше не находятся.
+    """
+
+    page_cache_namespace = None
+    # Параметры запроса, от которых зависит страница
+    page_cache_params = ('page', 'cursor')
+
+    def get_cache_tags(self):
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            not settings.PAGE_CACHE_TIMEOUT
+            or request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        namespace = self.page_cache_namespace
+        key = page_key(
+            request, namespace, self.get_cache_tags(), self.page_cache_params)
+        response = cache.get(key)
+        if response is not None:
+            _count(namespace, 'hit')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+
+        _count(namespace, 'miss')
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            response['X-Page-Cache'] = 'MISS'
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(
+                    lambda rendered: cache.set(
+                        key, rendered, settings.PAGE_CACHE_TIMEOUT)
+                )
+            else:
+                cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified, если страница не менялась.
+
+    ETag строится из версий тегов get_cache_tags() и того, кто смотрит,
+    поэтому проверка не выполняет запросов страницы. Last-Modified
+    отдаётся только анонимам: их страница не зависит от сессии.
+    """
+
+    def get_cache_tags(self):
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        tags = self.get_cache_tags()
+        etag = quote_etag(page_etag(request, tags))
+        last_modified = (
+            None if request.user.is_authenticated
+            else tags_changed_at(tags)
+        )
+        if settings.DATABASE_REPLICAS:
+            use_primary_if_changed(
+                last_modified if last_modified is not None
+                else tags_changed_at(tags)
+            )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            if request.user.is_authenticated:
+                patch_cache_control(response, no_cache=True, private=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+        return response
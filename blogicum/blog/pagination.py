@@ -0,0 +1,239 @@
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+FORWARD = 'n'
+BACKWARD = 'p'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(direction, value, pk):
+    microseconds = (value - EPOCH) // timedelta(microseconds=1)
+    raw = f'{direction}.{microseconds}.{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, microseconds, pk = raw.decode().split('.')
+        value = EPOCH + timedelta(microseconds=int(microseconds))
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError):
+        raise InvalidCursor('Некорректный курсор')
+    if direction not in (FORWARD, BACKWARD):
+        raise InvalidCursor('Некорректный курсор')
+    return direction, value, pk
+
+
+class CursorPage(Sequence):
+    cursor_mode = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по дате и id из ordering (по умолчанию от новых).
+
+    Каждая страница выбирается одним запросом с LIMIT и условием
+    на ключ последней показанной записи, без OFFSET и COUNT.
+    """
+
+    ordering = ('-pub_date', '-pk')
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.date_field = self.ordering[0].lstrip('-')
+        self.descending = self.ordering[0].startswith('-')
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._forward_page(self.queryset, first=True)
+        direction, value, pk = decode_cursor(cursor)
+        if direction == FORWARD:
+            return self._forward_page(
+                self.queryset.filter(self._beyond(value, pk, forward=True))
+            )
+        return self._backward_page(
+            self.queryset.filter(self._beyond(value, pk, forward=False))
+        )
+
+    def _beyond(self, value, pk, forward):
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return (
+            Q(**{f'{self.date_field}__{lookup}': value})
+            | Q(**{self.date_field: value, f'pk__{lookup}': pk})
+        )
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(
+            direction, getattr(obj, self.date_field), obj.pk
+        )
+
+    def _forward_page(self, queryset, first=False):
+        rows = list(
+            queryset.order_by(*self.ordering)[:self.per_page + 1]
+        )
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=(
+                self._cursor(FORWARD, rows[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                self._cursor(BACKWARD, rows[0]) if rows and not first
+                else None
+            ),
+        )
+
+    def _backward_page(self, queryset):
+        reverse_ordering = [
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        ]
+        rows = list(
+            queryset.order_by(*reverse_ordering)[:self.per_page + 1]
+        )
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=self._cursor(FORWARD, rows[-1]) if rows else None,
+            previous_cursor=(
+                self._cursor(BACKWARD, rows[0]) if has_previous else None
+            ),
+        )
+
+
+class CommentCursorPaginator(CursorPaginator):
+    """Ветка комментариев от старых к новым по (created_at, id)."""
+
+    ordering = ('created_at', 'pk')
+
+
+class FeedPage(Page):
+
+    # None — определять по числу страниц; иначе известно из выборки
+    # страницы за оценённым количеством.
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is not None:
+            return self.has_more
+        return super().has_next()
+
+    @property
+    def elided_page_range(self):
+        if self.number <= self.paginator.num_pages:
+            return self.paginator.get_elided_page_range(self.number)
+        first = max(2, self.number - self.paginator.ELIDED_ON_EACH_SIDE)
+        return [
+            1,
+            *([self.paginator.ELLIPSIS] if first > 2 else []),
+            *range(first, self.number + 1),
+        ]
+
+
+class FeedPaginator(Paginator):
+    """Постраничный вывод с дешёвым подсчётом публикаций.
+
+    Количество считается без JOIN'ов для вывода и сортировки, кэшируется
+    по cache_key и ограничивается count_limit: если публикаций больше,
+    count равен count_limit, а count_is_estimate — True. Страницы за
+    оценкой остаются доступны: их наличие проверяет выборка страницы.
+    """
+
+    ELIDED_ON_EACH_SIDE = 3
+
+    def __init__(self, object_list, per_page, cache_key=None,
+                 count_limit=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.count_limit = count_limit
+
+    @cached_property
+    def _count_and_estimate(self):
+        if self.cache_key is None:
+            return self._compute_count()
+        return cache.get_or_set(
+            self.cache_key,
+            self._compute_count,
+            settings.PUBLICATION_BUCKET_SECONDS,
+        )
+
+    @property
+    def count(self):
+        return self._count_and_estimate[0]
+
+    @property
+    def count_is_estimate(self):
+        return self._count_and_estimate[1]
+
+    def _compute_count(self):
+        queryset = self.object_list.order_by().select_related(None)
+        if self.count_limit is None:
+            return queryset.count(), False
+        count = queryset.values('pk')[:self.count_limit + 1].count()
+        if count > self.count_limit:
+            return self.count_limit, True
+        return count, False
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.count_is_estimate or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate or number < self.num_pages:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows:
+            raise EmptyPage('Страница не содержит результатов')
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.has_more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
@@ -0,0 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.db import connections
+
+
+def map_in_processes(func, *iterables, workers=1, chunksize=16):
+    """map() по пулу процессов; при workers <= 1 — в текущем процессе.
+
+    func должна быть функцией уровня модуля: её имя передаётся
+    в процессы пула, которые настраивают Django заново.
+    """
+    if workers <= 1:
+        return list(map(func, *iterables))
+    # Процессы пула открывают свои соединения с базой.
+    connections.close_all()
+    with ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup) as pool:
+        return list(pool.map(func, *iterables, chunksize=chunksize))
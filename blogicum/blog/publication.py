@@ -0,0 +1,71 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Post
+
+# Отправляется с post_ids, когда отложенные публикации выходят в ленту
+posts_published = Signal()
+_last_checked_bucket = None
+
+
+def publication_bucket(now=None):
+    now = now or timezone.now()
+    return int(now.timestamp()) // settings.PUBLICATION_BUCKET_SECONDS
+
+
+def publication_cutoff(now=None):
+    """Момент, до которого публикации считаются вышедшими.
+
+    Текущее время округляется вниз до границы корзины, поэтому все запросы
+    внутри одной корзины получают одинаковый SQL и могут кэшироваться,
+    а отложенная публикация никогда не показывается раньше срока.
+    """
+    return datetime.fromtimestamp(
+        publication_bucket(now) * settings.PUBLICATION_BUCKET_SECONDS,
+        tz=dt_timezone.utc,
+    )
+
+
+def publication_cache_key(*parts):
+    return ':'.join(
+        str(part) for part in ('blog', publication_bucket(), *parts)
+    )
+
+
+def publish_due_posts(now=None):
+    """Открывает публикации, время которых наступило, одним UPDATE.
+
+    Подписчики posts_published получают id открытых публикаций
+    после фиксации транзакции.
+    """
+    due = Post.objects.filter(
+        is_published=True,
+        is_visible=False,
+        pub_date__lt=now or timezone.now(),
+        category__is_published=True,
+    )
+    with transaction.atomic():
+        post_ids = list(due.values_list('pk', flat=True))
+        if post_ids:
+            Post.objects.filter(pk__in=post_ids).update(is_visible=True)
+            transaction.on_commit(lambda: posts_published.send(
+                sender=Post, post_ids=post_ids
+            ))
+    return post_ids
+
+
+def publish_due_posts_lazily():
+    """Выпускает отложенные публикации при чтении ленты.
+
+    Используется, когда фоновый планировщик не запущен: проверка
+    выполняется не чаще одного раза за корзину в каждом процессе.
+    """
+    global _last_checked_bucket
+    bucket = publication_bucket()
+    if bucket != _last_checked_bucket:
+        publish_due_posts(publication_cutoff())
+        _last_checked_bucket = bucket
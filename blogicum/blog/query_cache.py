@@ -0,0 +1,150 @@
+"""Кэш результатов отдельных запросов ORM.
+
+cached(queryset, name) помечает queryset: при вычислении его результат
+ищется в кэше по SQL, параметрам и версиям таблиц из VERSIONED_TABLES,
+которые этот SQL читает. Любой INSERT, UPDATE или DELETE в такую таблицу
+увеличивает её версию (обёртка выполнения запросов на всех соединениях),
+поэтому устаревшие результаты больше не находятся. Помечать можно только
+запросы, которые читают одни эти таблицы.
+
+Промах по запросу к таблицам, менявшимся за последние
+REPLICA_LAG_SECONDS, читается с основной базы: отстающая реплика
+положила бы старые строки в кэш под новой версией.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import DEFAULT_DB_ALIAS
+
+from blogicum.replicas import use_primary_if_changed
+from .cache_tags import (
+    invalidate_now_and_on_commit,
+    tag_versions,
+    tags_changed_at,
+)
+
+VERSIONED_TABLES = (
+    'blog_post',
+    'blog_comment',
+    'blog_category',
+    'blog_location',
+    'auth_user',
+)
+
+STATS_KEY = 'query_cache:stats:{name}:{outcome}'
+
+_WRITE = re.compile(
+    r'\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+_classes = {}
+
+
+def _table_tag(table):
+    return f'table:{table}'
+
+
+def _count(name, outcome):
+    key = STATS_KEY.format(name=name, outcome=outcome)
+    cache.add(key, 0, None)
+    cache.incr(key)
+
+
+def query_cache_stats(names):
+    keys = {
+        (name, outcome): STATS_KEY.format(name=name, outcome=outcome)
+        for name in names
+        for outcome in ('hit', 'miss')
+    }
+    values = cache.get_many(keys.values())
+    return {
+        name: {
+            outcome: values.get(keys[name, outcome], 0)
+            for outcome in ('hit', 'miss')
+        }
+        for name in names
+    }
+
+
+def bump_table_versions(execute, sql, params, many, context):
+    """Обёртка выполнения запросов: запись в таблицу меняет её версию."""
+    result = execute(sql, params, many, context)
+    match = _WRITE.match(sql)
+    if match and match.group(1) in VERSIONED_TABLES:
+        invalidate_now_and_on_commit(
+            _table_tag(match.group(1)),
+            using=context['connection'].alias,
+        )
+    return result
+
+
+def install_version_tracking(connection, **kwargs):
+    """Обработчик connection_created."""
+    if bump_table_versions not in connection.execute_wrappers:
+        connection.execute_wrappers.append(bump_table_versions)
+
+
+def query_key(queryset):
+    """Ключ результата queryset и теги его таблиц.
+
+    Для запроса, который не кэшируется, возвращает (None, []).
+    """
+    try:
+        sql, params = queryset.query.chain().get_compiler(
+            queryset.db).as_sql()
+    except EmptyResultSet:
+        return None, []
+    tags = [
+        _table_tag(table) for table in VERSIONED_TABLES if f'"{table}"' in sql
+    ]
+    versions = ':'.join(tag_versions(tags).values())
+    digest = hashlib.md5(repr((
+        queryset._iterable_class.__qualname__, sql, params,
+    )).encode()).hexdigest()
+    return f'query_cache:{queryset.db}:{versions}:{digest}', tags
+
+
+class CachedQuerySetMixin:
+
+    _query_cache_name = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._query_cache_name = self._query_cache_name
+        return clone
+
+    def _fetch_all(self):
+        name = self._query_cache_name
+        if (self._result_cache is None and name is not None
+                and settings.QUERY_CACHE_TIMEOUT):
+            key, tags = query_key(self)
+            if key is not None:
+                result = cache.get(key)
+                if result is None:
+                    _count(name, 'miss')
+                    if self.db != DEFAULT_DB_ALIAS:
+                        use_primary_if_changed(tags_changed_at(tags))
+                    result = list(self._iterable_class(self))
+                    cache.set(key, result, settings.QUERY_CACHE_TIMEOUT)
+                else:
+                    _count(name, 'hit')
+                self._result_cache = result
+        super()._fetch_all()
+
+
+def cached(queryset, name):
+    """Копия queryset, результат которой берётся из кэша.
+
+    name — под каким именем считать попадания и промахи.
+    """
+    clone = queryset._chain()
+    base = type(queryset)
+    if not issubclass(base, CachedQuerySetMixin):
+        if base not in _classes:
+            _classes[base] = type(
+                f'Cached{base.__name__}', (CachedQuerySetMixin, base), {})
+        clone.__class__ = _classes[base]
+    clone._query_cache_name = name
+    return clone
@@ -0,0 +1,66 @@
+"""Комментарии в отдельной базе settings.COMMENTS_DATABASE.
+
+Вставка комментария берёт блокировку записи только своего файла
+SQLite, поэтому частые комментарии не задерживают правку публикаций.
+Между базами нет JOIN'ов и внешних ключей: авторов комментариев
+подгружают отдельным запросом (with_authors), а удаление публикаций
+и пользователей удаляет их комментарии сигналами. Поэтому база
+комментариев создаётся с OPTIONS['foreign_keys'] = False, что проверяет
+check_comments_database; в основной базе ограничения остаются.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+def comments_are_separate():
+    return settings.COMMENTS_DATABASE != DEFAULT_DB_ALIAS
+
+
+def with_authors(comments):
+    """Комментарии вместе с авторами: JOIN или второй запрос."""
+    if comments_are_separate():
+        return comments.prefetch_related('author')
+    return comments.select_related('author')
+
+
+def _is_comment(obj):
+    return obj is not None and obj._meta.label == 'blog.Comment'
+
+
+class CommentRouter:
+
+    def _route(self, model, hints):
+        if not comments_are_separate():
+            return None
+        if _is_comment(model):
+            return settings.COMMENTS_DATABASE
+        # Публикация и автор комментария лежат в основной базе, а не
+        # в базе экземпляра-подсказки.
+        if _is_comment(hints.get('instance')):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints)
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not comments_are_separate():
+            return None
+        if _is_comment(obj1) or _is_comment(obj2):
+            aliases = {
+                DEFAULT_DB_ALIAS,
+                settings.COMMENTS_DATABASE,
+                *settings.DATABASE_REPLICAS,
+            }
+            return {obj1._state.db, obj2._state.db} <= aliases
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # В базе комментариев — только их таблица. В основной таблица
+        # комментариев остаётся пустой: на неё опираются старые миграции.
+        if comments_are_separate() and db == settings.COMMENTS_DATABASE:
+            return app_label == 'blog' and model_name == 'comment'
+        return None
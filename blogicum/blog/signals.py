@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from jobs.queue import enqueue
+from .cache_tags import (
+    GLOBAL_TAG,
+    invalidate_now_and_on_commit,
+    invalidate_post_pages,
+)
+from .counters import (
+    change_comment_count_with,
+    comment_count_handled,
+    delete_comments,
+    mark_posts_deleted,
+)
+from .images import delete_image_variants
+from .models import Category, Comment, Location, Post
+from .publication import posts_published
+from .query_cache import install_version_tracking
+from .routers import comments_are_separate
+from .tasks import refresh_post_image
+
+User = get_user_model()
+
+
+connection_created.connect(install_version_tracking)
+
+
+def invalidate_all_pages(*args, **kwargs):
+    invalidate_now_and_on_commit(GLOBAL_TAG)
+
+
+@receiver(pre_save, sender=Comment)
+def comment_saving(sender, instance, raw, **kwargs):
+    # Публикация, к которой комментарий относился до сохранения.
+    instance._saved_post_id = None
+    if instance.pk is not None and not raw:
+        instance._saved_post_id = (
+            Comment.objects.filter(pk=instance.pk)
+            .values_list('post_id', flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    old_post_id = getattr(instance, '_saved_post_id', None)
+    if created:
+        change_comment_count_with(instance, 1)
+        invalidate_post_pages(
+            Post.objects.filter(pk=instance.post_id),
+            f'thread:{instance.post_id}',
+        )
+    elif old_post_id is not None and old_post_id != instance.post_id:
+        change_comment_count_with(instance, -1, post_id=old_post_id)
+        change_comment_count_with(instance, 1)
+        invalidate_post_pages(
+            Post.objects.filter(pk__in=(old_post_id, instance.post_id)),
+            f'thread:{old_post_id}',
+            f'thread:{instance.post_id}',
+        )
+    else:
+        invalidate_now_and_on_commit(f'thread:{instance.post_id}')
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if comment_count_handled(instance):
+        return
+    change_comment_count_with(instance, -1)
+    invalidate_post_pages(
+        Post.objects.filter(pk=instance.post_id),
+        f'thread:{instance.post_id}',
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    # Счётчик и страницы удаляемой публикации по каждому её комментарию
+    # не обновляем.
+    mark_posts_deleted(instance.pk)
+    # CASCADE не достаёт до комментариев в другой базе.
+    if comments_are_separate():
+        Comment.objects.filter(post_id=instance.pk).delete()
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def post_changing(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        invalidate_post_pages(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, raw, **kwargs):
+    variants = instance.image_variants or {}
+    if not raw and variants.get('name', '') != instance.image.name:
+        enqueue(
+            refresh_post_image,
+            key=f'post-image:{instance.pk}:{instance.image.name}',
+            post_id=instance.pk,
+        )
+
+
+@receiver(post_delete, sender=Post)
+def post_image_deleted(sender, instance, **kwargs):
+    variants = instance.image_variants or {}
+    if variants:
+        storage = instance.image.storage
+        transaction.on_commit(
+            lambda: delete_image_variants(variants, storage))
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, raw, **kwargs):
+    if not raw:
+        invalidate_post_pages(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(posts_published)
+def posts_went_live(sender, post_ids, **kwargs):
+    invalidate_post_pages(Post.objects.filter(pk__in=post_ids))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created, raw, **kwargs):
+    if not created and not raw:
+        instance.posts.refresh_visibility()
+    invalidate_all_pages()
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    Post.objects.filter(category=None, is_visible=True).update(
+        is_visible=False
+    )
+    invalidate_all_pages()
+
+
+post_save.connect(invalidate_all_pages, sender=Location)
+post_delete.connect(invalidate_all_pages, sender=Location)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    if not created and set(update_fields or ()) != {'last_login'}:
+        invalidate_all_pages()
+
+
+@receiver(pre_delete, sender=User)
+def user_deleting(sender, instance, **kwargs):
+    # Комментарии автора удаляем пачкой до CASCADE; в другую базу
+    # CASCADE и не достаёт.
+    delete_comments(Comment.objects.filter(author_id=instance.pk))
+
+
+post_delete.connect(invalidate_all_pages, sender=User)
@@ -0,0 +1,17 @@
+from .cache_tags import invalidate_post_pages
+from .images import refresh_image_variants
+from .models import Post
+
+
+def refresh_post_image(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None:
+        return
+    try:
+        changed = refresh_image_variants(post)
+    except OSError:
+        # Файл недоступен или не читается: карточка покажет оригинал,
+        # копии достроит manage.py build_image_variants.
+        return
+    if changed:
+        invalidate_post_pages(Post.objects.filter(pk=post_id))
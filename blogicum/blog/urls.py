@@ -8,6 +8,8 @@ urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
     path('posts/<int:post_id>/',
          views.PostDetailView.as_view(), name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.PostCommentsView.as_view(), name='post_comments'),
     path('posts/create/',
          views.PostCreateView.as_view(), name='create_post'),
     path('posts/<post_id>/edit/',
@@ -1,9 +1,14 @@
+from functools import wraps
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.core.paginator import InvalidPage
+from django.db import router
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.utils import timezone
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -14,70 +19,190 @@ from django.views.generic import (
 from django.views.generic.edit import ModelFormMixin
 
 from blog.models import Category, Post, Comment
+from blogicum.write_queue import run_write
+from .cache_tags import tag_versions
 from .forms import PostForm, CommentForm, EditProfileForm
+from .page_cache import CachedPageMixin, ConditionalGetMixin
+from .pagination import (
+    CommentCursorPaginator,
+    CursorPaginator,
+    FeedPaginator,
+)
+from .publication import (
+    publication_cache_key,
+    publish_due_posts_lazily,
+)
+from .query_cache import cached
+from .routers import with_authors
 
 
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
 
 
 def get_posts(
         posts=Post.objects.all(),
         filter_published=True,
         select_related=True,
-        annotate=True):
+        viewer=None):
     if select_related:
-        posts = posts.select_related('category', 'location', 'author')
-    if annotate:
-        posts = posts.annotate(
-            comment_count=Count('comments')
-        ).order_by(
-            *posts.model._meta.ordering
-        )
-        
+        # Хэш пароля автора не нужен ни странице, ни кэшу запросов.
+        posts = posts.select_related(
+            'category', 'location', 'author'
+        ).defer('author__password')
     if filter_published:
-        posts = posts.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=timezone.now()
-        )
+        if not settings.PUBLICATION_SCHEDULER:
+            publish_due_posts_lazily()
+        visible = Q(is_visible=True)
+        if viewer is not None and viewer.is_authenticated:
+            visible |= Q(author=viewer)
+        posts = posts.filter(visible)
 
     return posts
 
 
-class AuthorPostMixin(LoginRequiredMixin):
-    def dispatch(self, request, *args, **kwargs):
-        object = self.get_object()
-        if object.author != request.user:
-            return redirect(
-                reverse('blog:post_detail', args=[object.id])
+def once_per_request(method):
+    """Запоминает результат метода view на время запроса."""
+    attr = f'_{method.__name__}_result'
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if args or kwargs:
+            return method(self, *args, **kwargs)
+        if not hasattr(self, attr):
+            setattr(self, attr, method(self))
+        return getattr(self, attr)
+
+    return wrapper
+
+
+class OwnedObjectMixin(LoginRequiredMixin):
+    """Загружает объект один раз вместе с признаком авторства.
+
+    Чужой объект перенаправляет на get_not_owner_url(): по умолчанию
+    not_owner_url или адрес самого объекта.
+    """
+
+    not_owner_url = None
+
+    def get_queryset(self):
+        return super().get_queryset().annotate(
+            is_owner=ExpressionWrapper(
+                Q(author_id=self.request.user.pk),
+                output_field=BooleanField(),
             )
+        )
+
+    @once_per_request
+    def get_object(self, queryset=None):
+        return super().get_object(queryset)
+
+    def get_not_owner_url(self):
+        return self.not_owner_url or self.get_object().get_absolute_url()
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.get_object().is_owner:
+            return redirect(self.get_not_owner_url())
         return super().dispatch(request, *args, **kwargs)
 
 
-class UserDetailView(ListView):
+class AuthorPostMixin(OwnedObjectMixin):
+    def get_queryset(self):
+        return super().get_queryset().select_related('category', 'location')
+
+
+class PostsPaginationMixin:
+    paginate_by = POSTS_PER_PAGE
+    paginator_class = FeedPaginator
+    cursor_kwarg = 'cursor'
+
+    def get_feed_key(self):
+        # None — количество публикаций не кэшируется.
+        return None
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        feed_key = self.get_feed_key()
+        return super().get_paginator(
+            queryset,
+            per_page,
+            cache_key=(
+                publication_cache_key('count', feed_key) if feed_key
+                else None
+            ),
+            count_limit=settings.POSTS_COUNT_LIMIT,
+            **kwargs
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(
+            **kwargs, fragment_timeout=settings.FRAGMENT_CACHE_TIMEOUT
+        )
+        page = context['page_obj']
+        versions = tag_versions(f'post:{post.pk}' for post in page)
+        for post in page:
+            post.fragment_version = versions[f'post:{post.pk}']
+        return context
+
+    def paginate_queryset(self, queryset, page_size):
+        if settings.POSTS_PAGINATION != 'cursor':
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class QueuedWriteMixin:
+    """Сохраняет форму через очередь записи, если она включена.
+
+    В потоке записи выполняется только form.save(), перенаправление
+    готовится уже в потоке запроса.
+    """
+
+    def form_valid(self, form):
+        self.object = run_write(
+            form.save, using=router.db_for_write(self.model))
+        return super(ModelFormMixin, self).form_valid(form)
+
+
+class UserDetailView(
+        ConditionalGetMixin,
+        CachedPageMixin,
+        PostsPaginationMixin,
+        ListView):
     model = User
     template_name = 'blog/profile.html'
-    paginate_by = POSTS_PER_PAGE
     slug_url_kwarg = 'username'
+    page_cache_namespace = 'profile'
 
+    @once_per_request
     def get_object(self):
         return get_object_or_404(
-            User,
+            cached(User.objects.defer('password'), 'user'),
             username=self.kwargs[self.slug_url_kwarg]
         )
 
     def get_queryset(self):
         author = self.get_object()
-        return get_posts_with_annotations(
+        return cached(get_posts(
             author.posts,
             filter_published=(self.request.user != author)
-        )
+        ), 'profile_posts')
+
+    def get_feed_key(self):
+        if self.request.user.username != self.kwargs[self.slug_url_kwarg]:
+            return f'profile:{self.kwargs[self.slug_url_kwarg]}'
+
+    def get_cache_tags(self):
+        return (f'profile:{self.kwargs[self.slug_url_kwarg]}',)
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(**kwargs, profile=self.get_object())
 
 
-class EditProfileView(LoginRequiredMixin, UpdateView):
+class EditProfileView(LoginRequiredMixin, QueuedWriteMixin, UpdateView):
     model = User
     form_class = EditProfileForm
     template_name = 'blog/user.html'
@@ -89,35 +214,65 @@ class EditProfileView(LoginRequiredMixin, UpdateView):
         return reverse('blog:profile', args=[self.request.user.username])
 
 
-class PostListView(ListView):
+class PostListView(
+        ConditionalGetMixin,
+        CachedPageMixin,
+        PostsPaginationMixin,
+        ListView):
     model = Post
     template_name = 'blog/index.html'
-    paginate_by = POSTS_PER_PAGE
-    queryset = get_posts_with_annotations()
+    page_cache_namespace = 'index'
+
+    def get_queryset(self):
+        return cached(get_posts(), 'index_posts')
 
+    def get_feed_key(self):
+        return 'index'
 
-class PostDetailView(LoginRequiredMixin, DetailView):
+    def get_cache_tags(self):
+        return ('index',)
+
+
+class PostDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    comments_per_page = COMMENTS_PER_PAGE
+    cursor_kwarg = 'cursor'
 
-    def get_object(self, queryset=None):
-        post = super().get_object(queryset)
-        return (
-            post
-            if post.author == self.request.user
-            else super().get_object(get_posts_with_annotations())
+    def get_cache_tags(self):
+        post_id = self.kwargs[self.pk_url_kwarg]
+        return (f'post:{post_id}', f'thread:{post_id}')
+
+    def get_queryset(self):
+        return get_posts(viewer=self.request.user)
+
+    def get_comments_page(self):
+        paginator = CommentCursorPaginator(
+            with_authors(self.object.comments.all()),
+            self.comments_per_page,
         )
+        try:
+            return paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
 
     def get_context_data(self, **kwargs):
+        thread_tag = f'thread:{self.object.pk}'
         return super().get_context_data(
             **kwargs,
             form=CommentForm(),
-            comments=self.object.comments.select_related('author')
+            comments=self.get_comments_page(),
+            fragment_timeout=settings.FRAGMENT_CACHE_TIMEOUT,
+            thread_version=tag_versions([thread_tag])[thread_tag],
         )
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCommentsView(PostDetailView):
+    template_name = 'includes/comment_list.html'
+
+
+class PostCreateView(LoginRequiredMixin, QueuedWriteMixin, CreateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
@@ -139,7 +294,7 @@ class PostMixin:
     pk_url_kwarg = 'post_id'
 
     def get_success_url(self):
-        return reverse('blog:profile', args=[self.object.author.username])
+        return reverse('blog:profile', args=[self.request.user.username])
 
 
 class PostUpdateView(AuthorPostMixin, PostMixin, UpdateView):
@@ -150,39 +305,50 @@ class PostDeleteView(AuthorPostMixin, PostMixin, ModelFormMixin, DeleteView):
     pass
 
 
-class CategoryPostsView(ListView):
+class CategoryPostsView(
+        ConditionalGetMixin,
+        CachedPageMixin,
+        PostsPaginationMixin,
+        ListView):
     model = Post
     template_name = 'blog/category.html'
-    paginate_by = POSTS_PER_PAGE
+    page_cache_namespace = 'category'
 
+    @once_per_request
     def get_category(self):
         return get_object_or_404(
-            Category,
+            cached(Category.objects.all(), 'category'),
             slug=self.kwargs['category_slug'],
             is_published=True
         )
 
     def get_queryset(self):
-        return get_posts_with_annotations(self.get_category().posts)
+        return cached(get_posts(self.get_category().posts), 'category_posts')
+
+    def get_feed_key(self):
+        return f'category:{self.kwargs["category_slug"]}'
+
+    def get_cache_tags(self):
+        return (f'category:{self.kwargs["category_slug"]}',)
 
     def get_context_data(self, object_list=None, **kwargs):
         return super().get_context_data(**kwargs, category=self.get_category())
 
 
-class CommentMixin(LoginRequiredMixin):
+class CommentMixin(OwnedObjectMixin):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    def get_queryset(self):
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
+
     def get_context_data(self, **kwargs):
         return super().get_context_data(**kwargs, post=self.get_object())
 
-    def dispatch(self, request, *args, **kwargs):
-        comment = self.get_object()
-        if comment.author != request.user:
-            return redirect('blog:post_detail', self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
+    def get_not_owner_url(self):
+        return reverse('blog:post_detail', args=[self.kwargs['post_id']])
 
     def get_success_url(self):
         return reverse(
@@ -190,7 +356,7 @@ class CommentMixin(LoginRequiredMixin):
         )
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, QueuedWriteMixin, CreateView):
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """Ограниченный пул соединений, общий для потоков процесса.
+
+    Открыто не больше max_size соединений; поток, которому не хватило,
+    ждёт до timeout секунд и получает PoolTimeout. Соединение, которое
+    простояло в пуле дольше check_after секунд, перед выдачей проверяется
+    функцией check; release возвращает соединение в пул, если reset
+    привела его в исходное состояние, иначе закрывает.
+    """
+
+    def __init__(self, max_size, timeout, check_after, check, reset):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_after = check_after
+        self.check = check
+        self.reset = reset
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self.in_use = 0
+        self.created = 0
+        self.discarded = 0
+
+    def acquire(self, connect):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f'Все {self.max_size} соединений пула заняты '
+                f'дольше {self.timeout} с')
+        try:
+            connection = self._take_idle() or self._connect(connect)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self.in_use += 1
+        return connection
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                # Последнее возвращённое соединение — самое «тёплое».
+                connection, released_at = self._idle.pop()
+            if (time.monotonic() - released_at < self.check_after
+                    or self.check(connection)):
+                return connection
+            self._close(connection)
+
+    def _connect(self, connect):
+        connection = connect()
+        with self._lock:
+            self.created += 1
+        return connection
+
+    def release(self, connection):
+        try:
+            if self.reset(connection):
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            else:
+                self._close(connection)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def _close(self, connection):
+        with self._lock:
+            self.discarded += 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_idle(self):
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'idle': len(self._idle),
+                'created': self.created,
+                'discarded': self.discarded,
+            }
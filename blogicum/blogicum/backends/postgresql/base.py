@@ -0,0 +1,109 @@
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from ..pool import ConnectionPool, PoolTimeout
+
+Database = base.Database
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def check_connection(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Database.Error:
+        return False
+    return True
+
+
+def reset_connection(connection):
+    """Откатывает незавершённую транзакцию; False — соединение не вернуть."""
+    if connection.closed:
+        return False
+    status = connection.get_transaction_status()
+    if status == extensions.TRANSACTION_STATUS_IDLE:
+        return True
+    if status not in (
+            extensions.TRANSACTION_STATUS_INTRANS,
+            extensions.TRANSACTION_STATUS_INERROR):
+        return False
+    try:
+        connection.rollback()
+    except Database.Error:
+        return False
+    return True
+
+
+def get_pool(key, options):
+    # Ключ включает pid: после fork соединения родителя не используются.
+    key = (os.getpid(), *key)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                max_size=options.get('max_size', 10),
+                timeout=options.get('timeout', 10),
+                check_after=options.get('check_after', 30),
+                check=check_connection,
+                reset=reset_connection,
+            )
+        return _pools[key]
+
+
+def pools():
+    with _pools_lock:
+        return {
+            key[1:]: pool for key, pool in _pools.items()
+            if key[0] == os.getpid()
+        }
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL с пулом соединений из OPTIONS['pool'].
+
+    OPTIONS['pool'] — словарь max_size, timeout и check_after (см.
+    ConnectionPool). Закрытие соединения Django возвращает его в пул,
+    поэтому CONN_MAX_AGE с пулом должен быть 0.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def pool(self):
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if options is None:
+            return None
+        settings_dict = self.settings_dict
+        return get_pool((
+            self.alias, settings_dict['NAME'], settings_dict['HOST'],
+            settings_dict['PORT'], settings_dict['USER'],
+        ), options)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool()
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        try:
+            connection = pool.acquire(
+                lambda: base.DatabaseWrapper.get_new_connection(
+                    self, conn_params))
+        except PoolTimeout as error:
+            raise Database.OperationalError(str(error))
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level)
+        return connection
+
+    def _close(self):
+        pool = self.pool()
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.release(self.connection)
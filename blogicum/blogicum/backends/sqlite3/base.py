@@ -0,0 +1,92 @@
+from urllib.parse import quote
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base, schema
+
+# PRAGMA, которые показывает manage.py sqlite_pragmas
+REPORTED_PRAGMAS = (
+    'journal_mode', 'synchronous', 'busy_timeout', 'cache_size',
+    'mmap_size', 'temp_store',
+)
+
+# Значения SQLite по умолчанию: с ними benchmark_db сравнивает настройки
+SQLITE_DEFAULTS = {
+    'journal_mode': 'DELETE',
+    'synchronous': 'FULL',
+    'cache_size': -2000,
+    'mmap_size': 0,
+    'temp_store': 'DEFAULT',
+}
+
+OPTIONS = (
+    'pragmas', 'transaction_mode', 'read_only', 'snapshot_of', 'foreign_keys',
+)
+
+TRANSACTION_MODES = (None, 'DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+def read_pragmas(connection, names=REPORTED_PRAGMAS):
+    """Текущие значения PRAGMA соединения Django."""
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            # Для базы в памяти mmap_size не возвращает ничего.
+            row = cursor.fetchone()
+            values[name] = row[0] if row else None
+    return values
+
+
+class DatabaseSchemaEditor(schema.DatabaseSchemaEditor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.connection.features.supports_foreign_keys:
+            self.sql_create_inline_fk = None
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite, настраиваемый на каждом новом соединении.
+
+    OPTIONS['pragmas'] — словарь PRAGMA, которые выполняются по порядку
+    сразу после подключения. OPTIONS['transaction_mode'] = 'IMMEDIATE'
+    берёт блокировку записи в начале транзакции: иначе транзакция,
+    начавшая с чтения, при записи получает «database is locked» сразу,
+    не дожидаясь busy_timeout. OPTIONS['read_only'] открывает файл
+    только для чтения, OPTIONS['snapshot_of'] — псевдоним базы, копией
+    которой manage.py refresh_replicas обновляет этот файл.
+    OPTIONS['foreign_keys'] = False создаёт таблицы без ограничений
+    внешних ключей: для базы, таблицы которой ссылаются на другую базу.
+    """
+
+    SchemaEditorClass = DatabaseSchemaEditor
+
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        if settings_dict['OPTIONS'].get('foreign_keys') is False:
+            self.features.supports_foreign_keys = False
+
+    def get_connection_params(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(f'Неверный transaction_mode: {mode!r}')
+        params = super().get_connection_params()
+        for option in OPTIONS:
+            params.pop(option, None)
+        if (self.settings_dict['OPTIONS'].get('read_only')
+                and not self.is_in_memory_db()):
+            params['database'] = f'file:{quote(params["database"])}?mode=ro'
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            if not name.isidentifier():
+                raise ImproperlyConfigured(f'Неверное имя PRAGMA: {name!r}')
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -0,0 +1,133 @@
+"""Чтение со всех реплик, запись и чтение своих изменений — с основной базы.
+
+На реплики уходят только чтения GET- и HEAD-запросов. Запрос, который
+что-то записал, дочитывает с основной базы и ставит cookie: следующие
+REPLICA_LAG_SECONDS секунд запросы этого браузера тоже читают с неё,
+пока реплики догоняют изменения.
+"""
+import os
+import random
+import sqlite3
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_COOKIE = 'use_primary_db'
+
+_request = ContextVar('replica_request', default=None)
+
+
+class _RequestState:
+    def __init__(self, primary):
+        self.primary = primary
+        self.wrote = False
+
+
+def use_primary():
+    """Оставшиеся чтения текущего запроса идут в основную базу."""
+    state = _request.get()
+    if state is not None:
+        state.primary = True
+
+
+def mark_written():
+    """Запрос записал данные мимо маршрутизатора, например чужим потоком."""
+    state = _request.get()
+    if state is not None:
+        state.wrote = True
+
+
+def use_primary_if_changed(changed_at):
+    """Читать с основной базы, если данные менялись за время отставания.
+
+    Иначе страница, собранная по реплике, попала бы в кэш под новой
+    версией тегов.
+    """
+    if time.time() - changed_at < settings.REPLICA_LAG_SECONDS:
+        use_primary()
+
+
+class ReplicaRouter:
+
+    def _aliases(self):
+        return {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+
+    def db_for_read(self, model, **hints):
+        state = _request.get()
+        if (
+            state is None
+            or state.primary
+            or state.wrote
+            or not settings.DATABASE_REPLICAS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _request.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = self._aliases()
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схему реплики получают вместе с данными.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RequestState(
+            primary=(
+                request.method not in ('GET', 'HEAD')
+                or STICKY_COOKIE in request.COOKIES
+            )
+        )
+        token = _request.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request.reset(token)
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_LAG_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+def refresh_snapshot(source, target):
+    """Атомарно заменяет файл target свежей копией базы SQLite source.
+
+    Открытые соединения дочитывают старую копию, новые открывают новую.
+    Копия переводится в режим журнала DELETE, чтобы её можно было
+    открыть только для чтения.
+    """
+    target = Path(target)
+    partial = target.with_name(f'{target.name}.partial')
+    source_db = sqlite3.connect(source)
+    target_db = sqlite3.connect(partial)
+    try:
+        source_db.backup(target_db)
+        target_db.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        target_db.close()
+        source_db.close()
+    os.replace(partial, target)
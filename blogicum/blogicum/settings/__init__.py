@@ -0,0 +1,18 @@
+"""Профиль настроек задаёт BLOGICUM_PROFILE: dev (по умолчанию), test, prod.
+
+Остальные переменные BLOGICUM_* читаются в самих профилях.
+"""
+import os
+
+_profile = os.environ.get('BLOGICUM_PROFILE', 'dev')
+
+if _profile == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif _profile == 'test':
+    from .test import *  # noqa: F401,F403
+elif _profile == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured(f'Неизвестный профиль настроек: {_profile}')
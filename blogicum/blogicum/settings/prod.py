@@ -0,0 +1,74 @@
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, EMAIL_BACKEND, TEMPLATES
+from .env import cache_from_url, env, env_bool, env_int, env_list
+
+PROFILE = 'prod'
+
+DEBUG = False
+
+SECRET_KEY = env('SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Задайте BLOGICUM_SECRET_KEY')
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', ['localhost', '127.0.0.1'])
+
+# Соединение с базой живёт CONN_MAX_AGE секунд и переживает запросы;
+# с пулом PostgreSQL соединение после запроса возвращается в пул,
+# а соединение со снимком SQLite держало бы уже заменённый файл
+DATABASES = {
+    alias: {
+        **database,
+        'CONN_MAX_AGE': (
+            0 if {'pool', 'snapshot_of'} & set(database.get('OPTIONS', {}))
+            else env_int('CONN_MAX_AGE', 60)
+        ),
+    }
+    for alias, database in DATABASES.items()
+}
+
+# Шаблоны компилируются один раз на процесс независимо от DEBUG
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Кэш общий для всех процессов: версии тегов страниц и счётчики
+# должны совпадать у всех обработчиков
+CACHES = {
+    'default': cache_from_url(
+        env('CACHE_URL', f'file://{BASE_DIR / "cache"}')),
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+PUBLICATION_SCHEDULER = env_bool('PUBLICATION_SCHEDULER', True)
+
+JOBS_MODE = env('JOBS_MODE', 'database')
+
+if JOBS_MODE != 'immediate':
+    JOBS_EMAIL_BACKEND = EMAIL_BACKEND
+    EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+
+MEDIA_ACCEL = env('MEDIA_ACCEL') or None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'blog.checks': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
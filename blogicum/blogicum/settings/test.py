@@ -0,0 +1,33 @@
+from .base import *  # noqa: F401,F403
+from .base import DATABASES, DEFAULT_DB_ALIAS, POSTGRES_POOL, SQLITE_OPTIONS
+from .env import database_from_url, env
+
+PROFILE = 'test'
+
+DEBUG = False
+
+# Стойкое хэширование паролей в тестах только замедляет создание
+# пользователей
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+JOBS_MODE = 'immediate'
+
+WRITE_QUEUE = False
+
+# BLOGICUM_TEST_DATABASE_URL — база для тестов, например PostgreSQL в CI.
+# Тесты с маркером postgres без неё пропускаются: pytest -m postgres
+if env('TEST_DATABASE_URL'):
+    DATABASES[DEFAULT_DB_ALIAS] = database_from_url(
+        env('TEST_DATABASE_URL'),
+        sqlite_options=SQLITE_OPTIONS,
+        pool=POSTGRES_POOL if POSTGRES_POOL['max_size'] else None,
+    )
+
+# Реплики и отдельную базу комментариев тесты включают сами
+DATABASES = {'default': DATABASES['default']}
+
+DATABASE_REPLICAS = []
+
+COMMENTS_DATABASE = DEFAULT_DB_ALIAS
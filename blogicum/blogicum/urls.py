@@ -1,11 +1,12 @@
 from django.contrib import admin
 from django.urls import include, path, reverse_lazy
 from django.conf import settings
-from django.conf.urls.static import static
 
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 
+from blog.media import serve_media, serve_static
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.internal_server_error'
@@ -24,9 +25,16 @@ urlpatterns = [
         ),
         name='registration',
     ),
+    path(f'{settings.MEDIA_URL.lstrip("/")}<path:path>', serve_media),
     path('', include('blog.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+if not settings.DEBUG:
+    # В режиме отладки статику отдаёт runserver из static_dev.
+    urlpatterns.insert(0, path(
+        f'{settings.STATIC_URL.lstrip("/")}<path:path>', serve_static
+    ))
 
-if settings.DEBUG:
+if settings.DEBUG and 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
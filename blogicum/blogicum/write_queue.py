@@ -0,0 +1,152 @@
+"""Запись в SQLite через один поток на базу.
+
+Потоки запросов не спорят за блокировку записи: run_write ставит
+вызов в ограниченную очередь и ждёт результат не дольше
+WRITE_QUEUE_TIMEOUT секунд. Поток записи забирает до WRITE_QUEUE_BATCH
+вызовов сразу и выполняет их в одной транзакции, каждый в своей точке
+сохранения: ошибка одного вызова не откатывает остальные. Обработчики
+transaction.on_commit, зарегистрированные вызовом, выполняет после
+фиксации ждавший его поток, а не поток записи.
+Включается WRITE_QUEUE = True.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db import transaction
+
+from .replicas import mark_written
+
+logger = logging.getLogger(__name__)
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+class WriteTimeout(OperationalError):
+    pass
+
+
+class Writer:
+
+    def __init__(self, alias, size, batch_size):
+        self.alias = alias
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=size)
+        self.thread = threading.Thread(
+            target=self.run, name=f'writer-{alias}', daemon=True)
+        self.thread.start()
+
+    def submit(self, call, timeout):
+        future = Future()
+        try:
+            self.queue.put((call, future), timeout=timeout)
+        except queue.Full:
+            raise WriteTimeout('Очередь записи переполнена')
+        return future
+
+    def stop(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        try:
+            while True:
+                batch = [self.queue.get()]
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = batch[-1] is None
+                self.write([item for item in batch if item is not None])
+                if stopping:
+                    return
+        finally:
+            connections[self.alias].close()
+
+    def write(self, batch):
+        batch = [
+            (call, future) for call, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+        connection = connections[self.alias]
+        results = []
+        try:
+            with transaction.atomic(using=self.alias):
+                for call, _ in batch:
+                    hooks = len(connection.run_on_commit)
+                    try:
+                        with transaction.atomic(using=self.alias):
+                            result = call()
+                    except Exception as error:
+                        results.append((None, error))
+                        continue
+                    # Обработчики фиксации уносим из потока записи.
+                    results.append(((result, [
+                        hook for _, hook in connection.run_on_commit[hooks:]
+                    ]), None))
+                    del connection.run_on_commit[hooks:]
+        except Exception as error:
+            logger.exception('Пачка записей не сохранена')
+            results = [(None, error)] * len(batch)
+        finally:
+            connections[self.alias].close_if_unusable_or_obsolete()
+        for (_, future), (result, error) in zip(batch, results):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+def writer(alias):
+    with _writers_lock:
+        if alias not in _writers:
+            _writers[alias] = Writer(
+                alias,
+                settings.WRITE_QUEUE_SIZE,
+                settings.WRITE_QUEUE_BATCH,
+            )
+        return _writers[alias]
+
+
+def stop_writers():
+    """Дожидается записи поставленных вызовов и останавливает потоки."""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for item in writers:
+        item.stop()
+
+
+def run_write(call, using=DEFAULT_DB_ALIAS):
+    """Выполняет call() в транзакции базы using и возвращает результат.
+
+    С очередью call выполняется в потоке записи, а его обработчики
+    on_commit — в текущем потоке после фиксации. Внутри уже открытой
+    транзакции очередь не используется: поток записи ждал бы её
+    блокировку.
+    """
+    if not settings.WRITE_QUEUE or connections[using].in_atomic_block:
+        with transaction.atomic(using=using):
+            return call()
+    timeout = settings.WRITE_QUEUE_TIMEOUT
+    future = writer(using).submit(call, timeout)
+    mark_written()
+    try:
+        result, hooks = future.result(timeout=timeout)
+    except FutureTimeout:
+        # Начатую запись дожидаемся: иначе ответ сообщил бы об ошибке,
+        # а данные всё равно сохранились бы.
+        if future.cancel():
+            raise WriteTimeout('Запись не выполнена за отведённое время')
+        result, hooks = future.result()
+    for hook in hooks:
+        hook()
+    return result
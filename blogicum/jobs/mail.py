@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .queue import enqueue
+
+
+def send_email(message):
+    email = EmailMultiAlternatives(
+        subject=message['subject'],
+        body=message['body'],
+        from_email=message['from_email'],
+        to=message['to'],
+        cc=message['cc'],
+        bcc=message['bcc'],
+        reply_to=message['reply_to'],
+        headers=message['headers'],
+        alternatives=[tuple(item) for item in message['alternatives']],
+        connection=get_connection(settings.JOBS_EMAIL_BACKEND),
+    )
+    email.send()
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Отправляет письма задачей send_email вместо запроса.
+
+    Сами письма доставляет бэкенд JOBS_EMAIL_BACKEND. Вложения
+    не поддерживаются: аргументы задачи хранятся в JSON.
+    """
+
+    def send_messages(self, email_messages):
+        for email in email_messages:
+            enqueue(send_email, message={
+                'subject': email.subject,
+                'body': email.body,
+                'from_email': email.from_email,
+                'to': email.to,
+                'cc': email.cc,
+                'bcc': email.bcc,
+                'reply_to': email.reply_to,
+                'headers': email.extra_headers,
+                'alternatives': getattr(email, 'alternatives', []),
+            })
+        return len(email_messages)
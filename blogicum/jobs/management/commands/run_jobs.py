@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.queue import (
+    purge_finished_jobs,
+    requeue_stale_jobs,
+    run_pending,
+    worker_id,
+)
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, проверяя очередь каждые --interval.')
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Пауза, когда очередь пуста, в секундах.')
+        parser.add_argument(
+            '--limit', type=int, default=None,
+            help='Выполнить не больше стольких задач за проход.')
+
+    def handle(self, *args, **options):
+        worker = worker_id()
+        while True:
+            requeue_stale_jobs()
+            done = run_pending(worker, limit=options['limit'])
+            purge_finished_jobs()
+            if done or options['verbosity'] > 1:
+                self.stdout.write(f'Выполнено задач: {done}')
+            if not options['loop']:
+                break
+            close_old_connections()
+            if not done:
+                time.sleep(options['interval'])
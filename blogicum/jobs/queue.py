@@ -0,0 +1,201 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending_keys = set()
+
+
+def task_name(task):
+    if isinstance(task, str):
+        return task
+    return f'{task.__module__}.{task.__qualname__}'
+
+
+def retry_delay(attempt):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempt - 1))
+
+
+def enqueue(task, *, key=None, **kwargs):
+    """Ставит вызов task(**kwargs) в очередь согласно JOBS_MODE.
+
+    task — функция уровня модуля или её путь, kwargs должны сохраняться
+    в JSON. Задача с ключом key, который уже встречался, не ставится,
+    если только прежняя не исчерпала попытки.
+    """
+    name = task_name(task)
+    if settings.JOBS_MODE == 'immediate':
+        # Не внутри транзакции, которая поставила задачу.
+        transaction.on_commit(lambda: import_string(name)(**kwargs))
+    elif settings.JOBS_MODE == 'thread':
+        transaction.on_commit(lambda: _submit(name, kwargs, key))
+    else:
+        return _create_job(name, kwargs, key)
+
+
+def _create_job(name, kwargs, key):
+    job = Job(
+        name=name,
+        kwargs=kwargs,
+        key=key,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        # Задачу, исчерпавшую попытки, ставим заново с новыми аргументами.
+        Job.objects.filter(key=key, status=Job.FAILED).update(
+            name=name,
+            kwargs=kwargs,
+            status=Job.QUEUED,
+            attempts=0,
+            max_attempts=settings.JOBS_MAX_ATTEMPTS,
+            run_after=timezone.now(),
+            last_error='',
+            finished_at=None,
+        )
+        return Job.objects.get(key=key)
+    return job
+
+
+def _thread_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.JOBS_THREADS,
+                thread_name_prefix='jobs',
+            )
+        return _pool
+
+
+def _submit(name, kwargs, key):
+    with _pool_lock:
+        if key is not None:
+            if key in _pending_keys:
+                return
+            _pending_keys.add(key)
+    _thread_pool().submit(_run_in_thread, name, kwargs, key)
+
+
+def _run_in_thread(name, kwargs, key, attempt=1):
+    retry = False
+    try:
+        import_string(name)(**kwargs)
+    except Exception:
+        retry = attempt < settings.JOBS_MAX_ATTEMPTS
+        if not retry:
+            logger.exception('Задача %s не выполнена', name)
+    finally:
+        connections.close_all()
+    if retry:
+        # Повтор ждёт в таймере, а не занимает поток пула.
+        timer = threading.Timer(
+            retry_delay(attempt).total_seconds(),
+            _thread_pool().submit,
+            (_run_in_thread, name, kwargs, key, attempt + 1),
+        )
+        timer.daemon = True
+        timer.start()
+        return
+    with _pool_lock:
+        _pending_keys.discard(key)
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def requeue_stale_jobs():
+    """Возвращает в очередь задачи обработчиков, переставших отвечать."""
+    return Job.objects.filter(
+        status=Job.RUNNING,
+        locked_at__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_LOCK_TIMEOUT),
+    ).update(status=Job.QUEUED, locked_by='', locked_at=None)
+
+
+def claim_job(worker):
+    """Берёт в работу одну готовую задачу или возвращает None.
+
+    Задачу забирает тот, чей UPDATE ... WHERE status='queued' изменил
+    строку, поэтому несколько обработчиков не возьмут одну задачу.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.QUEUED, run_after__lte=now
+    ).values_list('pk', flat=True)[:10]
+    for job_id in candidates:
+        claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_by=worker,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    try:
+        import_string(job.name)(**job.kwargs)
+    except Exception:
+        now = timezone.now()
+        error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED,
+                run_after=now + retry_delay(job.attempts),
+                locked_by='',
+                locked_at=None,
+                last_error=error,
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED, finished_at=now, last_error=error
+            )
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE, finished_at=timezone.now()
+    )
+    return True
+
+
+def run_pending(worker, limit=None):
+    """Выполняет готовые задачи, пока они есть; возвращает их число."""
+    done = 0
+    while limit is None or done < limit:
+        job = claim_job(worker)
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
+
+
+def purge_finished_jobs():
+    return Job.objects.filter(
+        status__in=(Job.DONE, Job.FAILED),
+        finished_at__lt=timezone.now() - timedelta(
+            days=settings.JOBS_RETENTION_DAYS),
+    ).delete()[0]
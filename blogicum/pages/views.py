@@ -1,13 +1,19 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from blog.page_cache import CachedPageMixin
 
-class AboutView(TemplateView):
+
+class AboutView(CachedPageMixin, TemplateView):
     template_name = 'pages/about.html'
+    page_cache_namespace = 'pages'
+    page_cache_params = ()
 
 
-class RulesView(TemplateView):
+class RulesView(CachedPageMixin, TemplateView):
     template_name = 'pages/rules.html'
+    page_cache_namespace = 'pages'
+    page_cache_params = ()
 
 
 def page_not_found(request, exception):
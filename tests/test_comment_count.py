@@ -0,0 +1,139 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+
+from blog.cache_tags import tag_versions
+from blog.counters import delete_comments
+from blog.forms import PostForm
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _stored_count(post):
+    post.refresh_from_db(fields=['comment_count'])
+    return post.comment_count
+
+
+def test_count_follows_create_and_delete(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for text in ('первый', 'второй'):
+        user_client.post(f'/posts/{post.id}/comment/', {'text': text})
+    assert _stored_count(post) == 2
+
+    comment = post.comments.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    assert _stored_count(post) == 1
+
+
+def test_count_follows_cascade(mixer, post_with_published_location):
+    post = post_with_published_location
+    commenter = mixer.blend('auth.User')
+    mixer.cycle(3).blend('blog.Comment', post=post, author=commenter)
+    assert _stored_count(post) == 3
+    commenter.delete()
+    assert _stored_count(post) == 0
+
+
+def test_count_follows_moved_comment(mixer, post_with_published_location):
+    old_post = post_with_published_location
+    new_post = mixer.blend('blog.Post', author=old_post.author)
+    comment = mixer.cycle(2).blend('blog.Comment', post=old_post)[0]
+    thread = f'thread:{old_post.pk}'
+    before = tag_versions([thread])
+    comment.post = new_post
+    comment.save()
+    assert tag_versions([thread]) != before, (
+        'Убедитесь, что перенос комментария сбрасывает кэш прежней ветки.'
+    )
+    assert (_stored_count(old_post), _stored_count(new_post)) == (1, 1), (
+        'Убедитесь, что перенос комментария в другую публикацию '
+        'меняет счётчики обеих.'
+    )
+
+
+def test_post_delete_skips_per_comment_work(
+        mixer, post_with_published_location, django_assert_num_queries):
+    post = post_with_published_location
+    mixer.cycle(50).blend('blog.Comment', post=post)
+    # Выборка комментариев и страниц публикации, два DELETE.
+    with django_assert_num_queries(4):
+        post.delete()
+
+
+def test_bulk_delete_updates_each_post_once(
+        mixer, post_with_published_location, django_assert_num_queries):
+    posts = [
+        post_with_published_location,
+        mixer.blend('blog.Post', author=post_with_published_location.author),
+    ]
+    for post in posts:
+        mixer.cycle(10).blend('blog.Comment', post=post)
+    mixer.blend('blog.Comment', post=posts[0])
+    # Точка сохранения, выборка, DELETE со сбором, два UPDATE,
+    # сброс страниц.
+    with django_assert_num_queries(8):
+        delete_comments(Comment.objects.filter(
+            pk__in=Comment.objects.order_by('pk').values('pk')[:20]))
+    assert [_stored_count(post) for post in posts] == [1, 0], (
+        'Убедитесь, что пакетное удаление меняет счётчики публикаций.'
+    )
+
+
+def test_rolled_back_post_delete_keeps_counting(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post)
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            type(post).objects.get(pk=post.pk).delete()
+            raise RuntimeError
+    comment.delete()
+    assert _stored_count(post) == 0, (
+        'Убедитесь, что откат удаления публикации не отключает её счётчик.'
+    )
+
+
+def test_feed_shows_stored_count(
+        mixer, user_client, post_with_published_location):
+    mixer.cycle(2).blend('blog.Comment', post=post_with_published_location)
+    content = user_client.get('/').content.decode()
+    assert 'Комментарии (2)' in content
+
+
+def test_recount_command_fixes_drift(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=40)
+    call_command('recount_comments', batch_size=1)
+    assert _stored_count(post) == 2
+
+
+def test_saving_stale_post_keeps_count(mixer, post_with_published_location):
+    post = type(post_with_published_location).objects.get(
+        pk=post_with_published_location.pk)
+    mixer.blend('blog.Comment', post=post)
+    form = PostForm(instance=post, data={
+        'title': 'Новый заголовок',
+        'text': post.text,
+        'pub_date': post.pub_date,
+        'category': post.category_id,
+        'location': post.location_id,
+        'is_published': post.is_published,
+    })
+    assert form.is_valid(), form.errors
+    form.save()
+    assert _stored_count(post) == 1, (
+        'Убедитесь, что сохранение формы публикации не затирает счётчик '
+        'комментариев, изменившийся после её загрузки.'
+    )
+
+
+def test_post_save_keeps_django_semantics(post_with_published_location):
+    post = post_with_published_location
+    type(post).objects.filter(pk=post.pk).delete()
+    post.save()
+    assert type(post).objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что Post.save не меняет поведение save() Django.'
+    )
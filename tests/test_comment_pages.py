@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comment
+from blog.views import COMMENTS_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def long_thread(mixer, post_with_published_location):
+    return mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+
+
+def test_detail_renders_first_comment_page(
+        user_client, post_with_published_location, long_thread):
+    post = post_with_published_location
+    response = user_client.get(f'/posts/{post.id}/')
+    comments = response.context['comments']
+    assert list(comments) == list(
+        Comment.objects.filter(post=post)[:COMMENTS_PER_PAGE]
+    ), 'Убедитесь, что на странице поста выводится первая страница ветки.'
+    assert (
+        f'/posts/{post.id}/comments/?cursor={comments.next_cursor}'
+        in response.content.decode()
+    )
+
+
+def test_fragment_returns_rest_of_thread(
+        user_client, post_with_published_location, long_thread):
+    post = post_with_published_location
+    first = user_client.get(f'/posts/{post.id}/').context['comments']
+    response = user_client.get(
+        f'/posts/{post.id}/comments/', {'cursor': first.next_cursor}
+    )
+    assert response.status_code == HTTPStatus.OK
+    rest = response.context['comments']
+    assert list(first) + list(rest) == list(Comment.objects.filter(post=post))
+    assert not rest.has_next()
+    content = response.content.decode()
+    assert '<html' not in content and 'Оставить комментарий' not in content
+    assert f'name="comment_{rest[0].id}"' in content
+
+
+def test_fragment_respects_post_visibility(
+        user_client, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f'/posts/{post.id}/comments/'
+    assert user_client.get(url).status_code == HTTPStatus.OK
+    assert another_user_client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_invalid_comment_cursor_is_404(
+        user_client, post_with_published_location):
+    response = user_client.get(
+        f'/posts/{post_with_published_location.id}/', {'cursor': 'garbage'}
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
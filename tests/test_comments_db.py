@@ -0,0 +1,143 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.test import override_settings
+
+from blog.checks import check_comments_database
+from blog.models import Comment, Post
+from blog.routers import with_authors
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+separate_comments = override_settings(COMMENTS_DATABASE='comments')
+
+SPLIT_SCRIPT = '''
+import django
+django.setup()
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+from django.utils import timezone
+from blog.counters import recount_comments
+from blog.models import Category, Comment, Post
+from django.contrib.auth.models import User
+
+call_command('migrate', verbosity=0)
+call_command('migrate', database='comments', verbosity=0)
+call_command('check')
+for alias in ('comments', 'default'):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('PRAGMA foreign_key_list(blog_comment)')
+        print(alias, 'fks:', len(cursor.fetchall()))
+author = User.objects.create_user('author')
+category = Category.objects.create(title='c', slug='c', description='d')
+post = Post.objects.create(
+    title='t', text='x', author=author, category=category,
+    pub_date=timezone.now())
+client = Client(HTTP_HOST='localhost')
+client.force_login(author)
+client.post(f'/posts/{post.pk}/comment/', {'text': 'привет'})
+post.refresh_from_db()
+print('stored:', Comment.objects.count(),
+      Comment.objects.using('default').count(), post.comment_count)
+print('shown:', 'привет' in client.get(f'/posts/{post.pk}/').content.decode())
+Post.objects.filter(pk=post.pk).update(comment_count=5)
+print('fixed:', recount_comments())
+post.delete()
+print('left:', Comment.objects.count())
+'''
+
+
+@separate_comments
+def test_comment_queries_use_comments_database():
+    assert router.db_for_read(Comment) == 'comments'
+    assert router.db_for_write(Comment) == 'comments', (
+        'Убедитесь, что комментарии пишутся в отдельную базу.'
+    )
+    assert router.db_for_read(Post) == 'default'
+    comment = Comment(pk=1)
+    comment._state.db = 'comments'
+    assert router.db_for_read(
+        get_user_model(), instance=comment) == 'default', (
+        'Убедитесь, что автор комментария читается из основной базы.'
+    )
+    post = Post(pk=1)
+    post._state.db = 'default'
+    assert router.allow_relation(comment, post)
+
+
+@separate_comments
+def test_comments_database_holds_only_comments():
+    assert router.allow_migrate('comments', 'blog', model_name='comment')
+    assert not router.allow_migrate('comments', 'blog', model_name='post')
+    assert not router.allow_migrate('comments', 'auth', model_name='user')
+    assert router.allow_migrate('default', 'blog', model_name='comment')
+
+
+@separate_comments
+def test_comments_database_needs_no_foreign_keys():
+    assert [error.id for error in check_comments_database(None)] == [
+        'blog.E001'
+    ], (
+        'Убедитесь, что отдельная база комментариев с внешними ключами '
+        'не проходит проверку.'
+    )
+
+
+def test_authors_are_joined_in_single_database():
+    assert with_authors(Comment.objects.all()).query.select_related
+    with separate_comments:
+        comments = with_authors(Comment.objects.all())
+    assert not comments.query.select_related
+    assert comments._prefetch_related_lookups == ('author',)
+
+
+def test_comments_in_own_sqlite_file(tmp_path):
+    environ = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith('BLOGICUM_')
+    }
+    environ.update(
+        DJANGO_SETTINGS_MODULE='blogicum.settings',
+        BLOGICUM_PROFILE='dev',
+        BLOGICUM_DATABASE_URL=f'sqlite:///{tmp_path / "db.sqlite3"}',
+        BLOGICUM_COMMENTS_DB='1',
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', SPLIT_SCRIPT],
+        cwd=PROJECT_DIR, env=environ, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / 'db.sqlite3.comments').exists()
+    assert 'stored: 1 0 1' in result.stdout, (
+        'Убедитесь, что комментарий хранится в своей базе, а счётчик '
+        'публикации обновляется.'
+    )
+    assert 'comments fks: 0' in result.stdout, (
+        'Убедитесь, что в базе комментариев нет внешних ключей.'
+    )
+    assert 'default fks: 2' in result.stdout, (
+        'Убедитесь, что в основной базе внешние ключи сохраняются.'
+    )
+    assert 'shown: True' in result.stdout
+    assert 'fixed: 1' in result.stdout
+    assert 'left: 0' in result.stdout, (
+        'Убедитесь, что удаление публикации удаляет её комментарии '
+        'из отдельной базы.'
+    )
+
+
+def test_comments_database_requires_sqlite():
+    environ = {**os.environ, 'BLOGICUM_COMMENTS_DB': '1',
+               'BLOGICUM_DATABASE_URL': 'postgres://localhost/blogicum',
+               'DJANGO_SETTINGS_MODULE': 'blogicum.settings'}
+    result = subprocess.run(
+        [sys.executable, '-c', 'import blogicum.settings'],
+        cwd=PROJECT_DIR, env=environ, capture_output=True, text=True,
+    )
+    assert 'BLOGICUM_COMMENTS_DB' in result.stderr
+
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+    )
+
+
+def test_unchanged_feed_returns_304(
+        user_client, post_with_published_location, feed_urls,
+        django_assert_max_num_queries):
+    for url in feed_urls:
+        etag = user_client.get(url)['ETag']
+        with django_assert_max_num_queries(2):
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert not response.content
+
+
+def test_changed_post_returns_200(
+        user_client, post_with_published_location, feed_urls):
+    etags = [user_client.get(url)['ETag'] for url in feed_urls]
+    post_with_published_location.title = 'Другой заголовок'
+    post_with_published_location.save()
+    for url, etag in zip(feed_urls, etags):
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_etag_depends_on_viewer(
+        user_client, another_user_client, unlogged_client,
+        post_with_published_location):
+    etags = {
+        client.get('/')['ETag']
+        for client in (user_client, another_user_client, unlogged_client)
+    }
+    assert len(etags) == 3
+
+
+def test_last_modified_only_for_anonymous(
+        user_client, unlogged_client, post_with_published_location):
+    assert 'Last-Modified' not in user_client.get('/')
+    last_modified = unlogged_client.get('/')['Last-Modified']
+    response = unlogged_client.get(
+        '/', HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_post_detail_revalidates_on_comment(
+        user_client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/'
+    # Первый ответ выставляет CSRF-cookie, от которой зависит ETag.
+    user_client.get(url)
+    etag = user_client.get(url)['ETag']
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag).status_code == HTTPStatus.NOT_MODIFIED
+
+    user_client.post(f'{url}comment/', {'text': 'Новый комментарий'})
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag).status_code == HTTPStatus.OK
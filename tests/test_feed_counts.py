@@ -0,0 +1,66 @@
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('enable_offset_pagination'),
+]
+
+
+@pytest.fixture
+def enable_offset_pagination():
+    with override_settings(POSTS_PAGINATION='offset'):
+        yield
+
+
+def test_count_is_cached_per_feed(
+        unlogged_client, many_posts_with_published_locations,
+        django_assert_num_queries):
+    response = unlogged_client.get('/')
+    assert response.context['page_obj'].paginator.count == len(
+        many_posts_with_published_locations)
+
+    with django_assert_num_queries(1):
+        unlogged_client.get('/', {'page': 2})
+
+
+@override_settings(POSTS_COUNT_LIMIT=N_PER_PAGE + 5)
+def test_count_is_estimated_above_limit(
+        unlogged_client, many_posts_with_published_locations):
+    response = unlogged_client.get('/')
+    paginator = response.context['page_obj'].paginator
+    assert paginator.count_is_estimate
+    assert paginator.count == N_PER_PAGE + 5
+    assert 'Последняя' not in response.content.decode()
+
+
+@override_settings(POSTS_COUNT_LIMIT=None)
+def test_page_range_is_elided(
+        mixer, unlogged_client, published_category):
+    mixer.cycle(N_PER_PAGE * 20).blend(
+        'blog.Post', category=published_category, is_published=True)
+    content = unlogged_client.get('/', {'page': 10}).content.decode()
+    assert '?page=10' not in content
+    assert '?page=9"' in content
+    assert '?page=5"' not in content
+    assert '…' in content
+    assert '?page=20"' in content
+
+
+@override_settings(POSTS_COUNT_LIMIT=5)
+def test_pages_past_estimate_are_reachable(
+        unlogged_client, many_posts_with_published_locations):
+    first = unlogged_client.get('/').context['page_obj']
+    assert first.has_next()
+    response = unlogged_client.get('/', {'page': 2})
+    assert response.status_code == 200, (
+        'Убедитесь, что страницы за оценённым количеством публикаций '
+        'доступны.'
+    )
+    page = response.context['page_obj']
+    assert len(page) == N_PER_PAGE
+    assert not page.has_next()
+    assert 'записей больше 5' in response.content.decode()
+    assert unlogged_client.get('/', {'page': 3}).status_code == 404
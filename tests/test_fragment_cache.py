@@ -0,0 +1,63 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.cache_tags import tag_versions
+
+pytestmark = [pytest.mark.django_db]
+
+
+def card_key(post):
+    version = tag_versions([f'post:{post.id}'])[f'post:{post.id}']
+    return make_template_fragment_key('post_card', [post.id, version])
+
+
+def test_card_is_shared_between_feeds(
+        user_client, another_user_client, user,
+        post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+    cached = cache.get(card_key(post))
+    assert cached and post.title in cached
+
+    response = another_user_client.get(f'/profile/{user.username}/')
+    assert cached in response.content.decode()
+
+
+def test_card_is_rerendered_after_change(
+        mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.get('/')
+    post.title = 'Исправленный заголовок'
+    post.save()
+    assert post.title in user_client.get('/').content.decode()
+
+    mixer.blend('blog.Comment', post=post)
+    assert 'Комментарии (1)' in user_client.get('/').content.decode()
+
+
+def test_comment_buttons_stay_per_user(
+        user_client, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Мой отзыв'})
+    comment = post.comments.get()
+    edit_url = f'/posts/{post.id}/edit_comment/{comment.id}/'
+
+    assert edit_url in user_client.get(f'/posts/{post.id}/').content.decode()
+    content = another_user_client.get(f'/posts/{post.id}/').content.decode()
+    assert 'Мой отзыв' in content
+    assert edit_url not in content
+
+
+def test_comment_edit_refreshes_thread(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', {'text': 'Черновик'})
+    comment = post.comments.get()
+    user_client.get(f'/posts/{post.id}/')
+    user_client.post(
+        f'/posts/{post.id}/edit_comment/{comment.id}/', {'text': 'Итог'})
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert 'Итог' in content
+    assert 'Черновик' not in content
+
@@ -0,0 +1,109 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+
+# Копии фото строятся после фиксации транзакции сохранения.
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WIDTHS = (320, 640, 1280)
+    settings.POST_IMAGE_DEFAULT_WIDTH = 640
+
+
+def make_image(width, height, name='photo.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG')
+    return ImageFile(buffer, name=name)
+
+
+@pytest.fixture
+def large_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image(1600, 1000),
+    )
+
+
+def test_upload_builds_variants(large_post):
+    variants = Post.objects.get(pk=large_post.pk).image_variants
+    assert (variants['width'], variants['height']) == (1600, 1000)
+    assert [size['width'] for size in variants['sizes']] == [320, 640, 1280]
+    for size in variants['sizes']:
+        assert default_storage.exists(size['name'])
+        with default_storage.open(size['name']) as file:
+            assert Image.open(file).size == (size['width'], size['height'])
+
+
+def test_small_image_keeps_only_dimensions(mixer, user):
+    post = mixer.blend('blog.Post', author=user, image=make_image(200, 100))
+    post.refresh_from_db()
+    assert post.image_variants['sizes'] == []
+    assert post.responsive_image.srcset == ''
+    assert post.responsive_image.src == post.image.url
+
+
+def test_feed_card_uses_srcset(user_client, large_post):
+    content = user_client.get('/').content.decode()
+    assert content.count('srcset=') == 1
+    assert 'srcset="' in content and '1600w' in content
+    assert 'width="1600" height="1000"' in content
+    assert '-640w.jpg"' in content.split('srcset')[0], (
+        'Убедитесь, что в src карточки выводится уменьшенная копия фото.'
+    )
+
+
+def test_new_image_replaces_variants(large_post):
+    large_post.refresh_from_db()
+    old_names = [size['name'] for size in large_post.image_variants['sizes']]
+    large_post.image = make_image(800, 400, name='other.jpg')
+    large_post.save()
+    large_post.refresh_from_db()
+    assert [size['width'] for size in large_post.image_variants['sizes']] == [
+        320, 640]
+    assert not any(default_storage.exists(name) for name in old_names)
+
+
+def test_backfill_command(large_post):
+    Post.objects.update(image_variants={})
+    call_command('build_image_variants', workers=1)
+    variants = Post.objects.get(pk=large_post.pk).image_variants
+    assert variants['name'] == large_post.image.name
+    assert len(variants['sizes']) == 3
+
+
+def test_similar_names_keep_own_variants(mixer, user, published_category):
+    posts = [
+        mixer.blend('blog.Post', author=user, category=published_category,
+                    image=make_image(1600, 1000, name=name))
+        for name in ('photo.jpg', 'photo.jpeg', 'photo.jpg')
+    ]
+    names = [
+        size['name']
+        for post in Post.objects.filter(pk__in=[post.pk for post in posts])
+        for size in post.image_variants['sizes']
+    ]
+    assert len(names) == len(set(names)) == 9, (
+        'Убедитесь, что копии разных фото не перезаписывают друг друга.'
+    )
+    assert all(default_storage.exists(name) for name in names)
+
+
+def test_post_delete_removes_variants(
+        large_post, django_capture_on_commit_callbacks):
+    large_post.refresh_from_db()
+    names = [size['name'] for size in large_post.image_variants['sizes']]
+    with django_capture_on_commit_callbacks(execute=True):
+        large_post.delete()
+    assert not any(default_storage.exists(name) for name in names), (
+        'Убедитесь, что удаление публикации удаляет копии её фото.'
+    )
@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+
+from blog.models import Category, Comment, Post
+from blog.pagination import CursorPaginator
+from blog.views import get_posts
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN is SQLite'
+    ),
+]
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' | '.join(row[-1] for row in cursor.fetchall())
+
+
+def feed(posts, **kwargs):
+    return get_posts(posts, **kwargs).order_by(*CursorPaginator.ordering)[:11]
+
+
+def test_index_feed_uses_published_index():
+    plan = query_plan(feed(Post.objects.all()))
+    assert 'post_published_feed_idx' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_category_feed_uses_category_index():
+    plan = query_plan(feed(Category(pk=1).posts.all()))
+    assert 'post_category_feed_idx' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+@pytest.mark.parametrize('filter_published', (True, False))
+def test_profile_feed_uses_author_index(user, filter_published):
+    plan = query_plan(
+        feed(user.posts.all(), filter_published=filter_published)
+    )
+    assert 'post_author_feed_idx' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_comment_thread_uses_thread_index():
+    plan = query_plan(
+        Comment.objects.filter(post_id=1).select_related('author')
+    )
+    assert 'comment_post_thread_idx' in plan, plan
+    assert 'TEMP B-TREE' not in plan, plan
@@ -0,0 +1,158 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import send_mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from jobs.models import Job
+from jobs.queue import claim_job, enqueue, run_job, worker_id
+from test_image_variants import make_image
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+done = threading.Event()
+
+
+def record(value):
+    calls.append(value)
+    done.set()
+
+
+def fail(value):
+    raise RuntimeError(value)
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+    done.clear()
+
+
+@pytest.fixture
+def database_mode(settings):
+    settings.JOBS_MODE = 'database'
+    settings.JOBS_MAX_ATTEMPTS = 3
+    settings.JOBS_RETRY_DELAY = 10
+
+
+def test_immediate_mode_runs_after_commit(
+        settings, django_capture_on_commit_callbacks):
+    settings.JOBS_MODE = 'immediate'
+    with django_capture_on_commit_callbacks(execute=True):
+        enqueue(record, value=1)
+        assert calls == [], (
+            'Убедитесь, что задача не выполняется внутри транзакции.'
+        )
+    assert calls == [1]
+
+
+def test_database_mode_defers_until_worker(database_mode):
+    job = enqueue(record, value=1)
+    assert calls == [] and job.status == Job.QUEUED
+    call_command('run_jobs')
+    assert calls == [1]
+    job.refresh_from_db()
+    assert job.status == Job.DONE and job.attempts == 1
+
+
+def test_idempotency_key(database_mode):
+    first = enqueue(record, key='once', value=1)
+    assert enqueue(record, key='once', value=2) == first
+    call_command('run_jobs')
+    assert enqueue(record, key='once', value=3) == first
+    call_command('run_jobs')
+    assert calls == [1]
+
+
+def test_failed_job_is_retried_with_backoff(database_mode):
+    job = enqueue(fail, value='boom')
+    before = timezone.now()
+    assert not run_job(claim_job(worker_id()))
+    job.refresh_from_db()
+    assert job.status == Job.QUEUED and 'boom' in job.last_error
+    assert job.run_after >= before + timedelta(seconds=10)
+    assert claim_job(worker_id()) is None, (
+        'Убедитесь, что повтор задачи откладывается.'
+    )
+
+    for _ in range(2):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_job(claim_job(worker_id()))
+    job.refresh_from_db()
+    assert job.status == Job.FAILED and job.attempts == 3
+
+
+def test_failed_key_is_requeued(database_mode):
+    job = enqueue(fail, key='retry', value='boom')
+    Job.objects.filter(pk=job.pk).update(status=Job.FAILED, attempts=3)
+    assert enqueue(record, key='retry', value=2) == job
+    job.refresh_from_db()
+    assert job.status == Job.QUEUED and job.attempts == 0, (
+        'Убедитесь, что задача, исчерпавшая попытки, ставится заново.'
+    )
+    call_command('run_jobs')
+    assert calls == [2]
+
+
+def test_stale_running_job_is_requeued(database_mode, settings):
+    job = enqueue(record, value=1)
+    claim_job('dead-worker')
+    Job.objects.filter(pk=job.pk).update(
+        locked_at=timezone.now()
+        - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT + 1)
+    )
+    call_command('run_jobs')
+    assert calls == [1]
+
+
+def test_queued_email_backend(database_mode, settings):
+    settings.EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+    settings.JOBS_EMAIL_BACKEND = (
+        'django.core.mail.backends.locmem.EmailBackend')
+    send_mail('Тема', 'Текст', 'from@example.com', ['to@example.com'])
+    assert mail.outbox == [] and Job.objects.count() == 1
+    call_command('run_jobs')
+    assert [message.subject for message in mail.outbox] == ['Тема']
+
+
+def test_post_image_is_processed_by_worker(
+        database_mode, settings, tmp_path, mixer, user):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WIDTHS = (320,)
+    post = mixer.blend('blog.Post', author=user, image=make_image(800, 600))
+    assert Post.objects.get(pk=post.pk).image_variants == {}
+    call_command('run_jobs')
+    assert len(Post.objects.get(pk=post.pk).image_variants['sizes']) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_mode_runs_after_commit(settings):
+    settings.JOBS_MODE = 'thread'
+    enqueue(record, value=1)
+    assert done.wait(5)
+    assert calls == [1]
+
+
+flaky_calls = []
+
+
+def flaky(value):
+    flaky_calls.append(value)
+    if len(flaky_calls) == 1:
+        raise RuntimeError(value)
+    record(value)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_mode_retry_is_scheduled(settings):
+    settings.JOBS_MODE = 'thread'
+    settings.JOBS_RETRY_DELAY = 0.01
+    flaky_calls.clear()
+    enqueue(flaky, key='flaky', value=1)
+    assert done.wait(5)
+    assert calls == [1] and len(flaky_calls) == 2
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+pytestmark = [pytest.mark.django_db]
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL = None
+    return default_storage.save('post_images/data.jpg', ContentFile(CONTENT))
+
+
+def body(response):
+    return b''.join(response.streaming_content)
+
+
+def test_full_file(client, media_file):
+    response = client.get(f'/media/{media_file}')
+    assert response.status_code == HTTPStatus.OK
+    assert body(response) == CONTENT
+    assert response['Content-Type'] == 'image/jpeg'
+    assert response['Accept-Ranges'] == 'bytes' and response['ETag']
+
+
+@pytest.mark.parametrize('header, start, end', (
+    ('bytes=0-99', 0, 99),
+    ('bytes=100-', 100, len(CONTENT) - 1),
+    ('bytes=-50', len(CONTENT) - 50, len(CONTENT) - 1),
+    ('bytes=10000-99999', 10000, len(CONTENT) - 1),
+))
+def test_range(client, media_file, header, start, end):
+    response = client.get(f'/media/{media_file}', HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert body(response) == CONTENT[start:end + 1]
+    assert int(response['Content-Length']) == end - start + 1
+    assert response['Content-Range'] == f'bytes {start}-{end}/{len(CONTENT)}'
+
+
+def test_unsatisfiable_range(client, media_file):
+    response = client.get(f'/media/{media_file}', HTTP_RANGE='bytes=99999-')
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+
+
+def test_stale_if_range_sends_whole_file(client, media_file):
+    response = client.get(
+        f'/media/{media_file}', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"old"'
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_conditional_get(client, media_file):
+    etag = client.get(f'/media/{media_file}')['ETag']
+    response = client.get(f'/media/{media_file}', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('accel, header, value', (
+    ('x-accel-redirect', 'X-Accel-Redirect',
+     '/protected-media/post_images/data.jpg'),
+    ('x-sendfile', 'X-Sendfile', 'post_images/data.jpg'),
+))
+def test_front_server_sends_bytes(
+        client, media_file, settings, accel, header, value):
+    settings.MEDIA_ACCEL = accel
+    response = client.get(f'/media/{media_file}')
+    assert response.status_code == HTTPStatus.OK
+    assert response[header].endswith(value)
+    assert response.content == b''
+
+
+@pytest.mark.parametrize('path', ('missing.jpg', '../settings.py'))
+def test_missing_or_outside_file_is_404(client, media_file, path):
+    assert client.get(f'/media/{path}').status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+
+from blog.images import accepted_types, modern_formats
+from test_image_variants import make_image
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.skipif(
+        'webp' not in modern_formats(), reason='Pillow собран без WebP'),
+]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_WIDTHS = (320,)
+    settings.POST_IMAGE_FORMATS = ('webp',)
+
+
+@pytest.fixture
+def post_with_copies(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image(800, 600),
+    )
+    post.refresh_from_db()
+    post.report = StringIO()
+    call_command('build_modern_images', workers=1, stdout=post.report)
+    return post
+
+
+def test_batch_job_writes_smaller_copies(post_with_copies):
+    names = [post_with_copies.image.name] + [
+        size['name'] for size in post_with_copies.image_variants['sizes']
+    ]
+    for name in names:
+        assert default_storage.exists(f'{name}.webp')
+        assert (
+            default_storage.size(f'{name}.webp') < default_storage.size(name)
+        )
+    report = post_with_copies.report.getvalue()
+    assert 'Файлов: 2' in report and 'WEBP: копий 2' in report
+
+
+@pytest.mark.parametrize('accept, content_type', (
+    ('image/webp,image/*;q=0.8', 'image/webp'),
+    ('image/*', 'image/jpeg'),
+    ('image/webp;q=0, image/*;q=0.8', 'image/jpeg'),
+    ('image/webp ; q=0.5', 'image/webp'),
+))
+def test_media_negotiates_format(
+        client, post_with_copies, accept, content_type):
+    response = client.get(
+        post_with_copies.image.url, HTTP_ACCEPT=accept
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == content_type
+    assert 'Accept' in response['Vary']
+
+
+def test_new_image_drops_stale_copies(post_with_copies):
+    old_name = post_with_copies.image.name
+    post_with_copies.image = make_image(500, 400, name='other.jpg')
+    post_with_copies.save()
+    assert not default_storage.exists(f'{old_name}.webp')
+
+
+def test_accepted_types_skip_zero_quality():
+    assert accepted_types('image/avif;q=0, image/webp;q=0.9, */*') == {
+        'image/webp', '*/*'
+    }, 'Убедитесь, что типы с q=0 не считаются принятыми.'
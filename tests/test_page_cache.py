@@ -0,0 +1,103 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{user.username}/',
+        '/pages/about/',
+    )
+
+
+def test_anonymous_pages_are_served_from_cache(
+        unlogged_client, post_with_published_location, feed_urls,
+        django_assert_num_queries):
+    for url in feed_urls:
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = unlogged_client.get(url)
+        assert response['X-Page-Cache'] == 'HIT'
+
+
+def test_logged_in_pages_are_not_cached(user_client, feed_urls):
+    for url in feed_urls:
+        user_client.get(url)
+        assert 'X-Page-Cache' not in user_client.get(url)
+
+
+def test_cursor_is_part_of_key(
+        unlogged_client, many_posts_with_published_locations):
+    first = unlogged_client.get('/')
+    cursor = first.context['page_obj'].next_cursor
+    second = unlogged_client.get('/', {'cursor': cursor})
+    assert second['X-Page-Cache'] == 'MISS'
+    assert second.content != first.content
+
+
+def test_post_changes_invalidate_pages(
+        mixer, unlogged_client, user, published_category,
+        post_with_published_location, feed_urls):
+    for url in feed_urls:
+        unlogged_client.get(url)
+
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, title='Свежая публикация')
+    for url in feed_urls[:3]:
+        response = unlogged_client.get(url)
+        assert response['X-Page-Cache'] == 'MISS'
+        assert post.title in response.content.decode()
+    assert unlogged_client.get(feed_urls[3])['X-Page-Cache'] == 'HIT'
+
+
+def test_comment_invalidates_feed(
+        mixer, unlogged_client, post_with_published_location):
+    unlogged_client.get('/')
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    response = unlogged_client.get('/')
+    assert response['X-Page-Cache'] == 'MISS'
+    assert 'Комментарии (1)' in response.content.decode()
+
+
+def test_category_change_invalidates_everything(
+        unlogged_client, post_with_published_location, feed_urls):
+    for url in feed_urls:
+        unlogged_client.get(url)
+    category = post_with_published_location.category
+    category.title = 'Новое название'
+    category.save()
+    for url in feed_urls:
+        assert unlogged_client.get(url)['X-Page-Cache'] == 'MISS'
+
+
+def test_login_does_not_invalidate(client, user, feed_urls):
+    unlogged_client = type(client)()
+    unlogged_client.get('/')
+    client.force_login(user)
+    assert unlogged_client.get('/')['X-Page-Cache'] == 'HIT'
+
+
+def test_stats_command(unlogged_client):
+    unlogged_client.get('/')
+    unlogged_client.get('/')
+    out = StringIO()
+    call_command('page_cache_stats', stdout=out)
+    assert 'index: попаданий 1, промахов 1' in out.getvalue()
+
+
+def test_unknown_params_share_cached_page(
+        unlogged_client, post_with_published_location, feed_urls):
+    for url in feed_urls:
+        unlogged_client.get(url)
+        response = unlogged_client.get(url, {'utm_source': 'x', 'x': '1'})
+        assert response['X-Page-Cache'] == 'HIT', (
+            'Убедитесь, что посторонние параметры запроса не создают '
+            'новых записей в кэше страниц.'
+        )
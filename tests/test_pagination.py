@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('enable_cursor_pagination'),
+]
+
+
+@pytest.fixture
+def enable_cursor_pagination():
+    with override_settings(POSTS_PAGINATION='cursor'):
+        yield
+
+
+def _walk(client, url, cursor_attr):
+    pages = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page = response.context['page_obj']
+        pages.append(list(page))
+        cursor = getattr(page, cursor_attr)
+        if cursor is None:
+            return pages, page
+        response = client.get(url, {'cursor': cursor})
+
+
+@pytest.mark.parametrize('url', ('/', '/category/{slug}/', '/profile/{user}/'))
+def test_cursor_pages_cover_feed_in_order(
+        user_client, user, published_category,
+        many_posts_with_published_locations, url):
+    url = url.format(slug=published_category.slug, user=user.username)
+    pages, last_page = _walk(user_client, url, 'next_cursor')
+
+    posts = [post for page in pages for post in page]
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+    assert len(posts) == len(many_posts_with_published_locations), (
+        'Убедитесь, что при переходе по курсорам лента выводится полностью.'
+    )
+    assert len({post.id for post in posts}) == len(posts)
+    keys = [(post.pub_date, post.id) for post in posts]
+    assert keys == sorted(keys, reverse=True)
+
+    response = user_client.get(url, {'cursor': last_page.previous_cursor})
+    assert list(response.context['page_obj']) == pages[-2]
+
+
+def test_cursor_links_rendered(
+        user_client, many_posts_with_published_locations):
+    response = user_client.get('/')
+    page = response.context['page_obj']
+    assert page.has_next() and not page.has_previous()
+    assert f'?cursor={page.next_cursor}' in response.content.decode()
+
+
+@pytest.mark.parametrize('cursor', ('garbage', 'eC4xLjE', '!!!'))
+def test_invalid_cursor_is_404(user_client, cursor):
+    response = user_client.get('/', {'cursor': cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_deep_page_has_constant_queries(
+        user_client, many_posts_with_published_locations,
+        django_assert_max_num_queries):
+    user_client.get('/')
+    _, last_page = _walk(user_client, '/', 'next_cursor')
+    with django_assert_max_num_queries(4):
+        user_client.get('/', {'cursor': last_page.previous_cursor})
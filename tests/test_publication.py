@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from blog import publication
+
+pytestmark = [pytest.mark.django_db]
+
+NOW = datetime(2025, 3, 1, 12, 30, 42, 123456, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    clock = {'now': NOW}
+    monkeypatch.setattr(timezone, 'now', lambda: clock['now'])
+    return clock
+
+
+@override_settings(PUBLICATION_BUCKET_SECONDS=60)
+def test_cutoff_is_rounded_down_to_bucket(frozen_now):
+    assert publication.publication_cutoff() == NOW.replace(
+        second=0, microsecond=0
+    )
+    key = publication.publication_cache_key('index', 1)
+    frozen_now['now'] = NOW + timedelta(seconds=10)
+    assert publication.publication_cache_key('index', 1) == key
+    frozen_now['now'] = NOW + timedelta(seconds=20)
+    assert publication.publication_cache_key('index', 1) != key
+
+
+@override_settings(PUBLICATION_BUCKET_SECONDS=60)
+def test_scheduled_post_appears_without_restart(
+        frozen_now, mixer, user_client, published_category):
+    post = mixer.blend(
+        'blog.Post',
+        category=published_category,
+        is_published=True,
+        pub_date=NOW + timedelta(seconds=30),
+    )
+    assert post not in user_client.get('/').context['page_obj']
+
+    frozen_now['now'] = NOW + timedelta(seconds=90)
+    assert post in user_client.get('/').context['page_obj']
+
+
+def test_category_toggle_updates_visibility(
+        another_user_client, post_with_published_location):
+    post = post_with_published_location
+    category = post.category
+    category.is_published = False
+    category.save()
+    post.refresh_from_db()
+    assert not post.is_visible
+    assert another_user_client.get(
+        f'/posts/{post.id}/').status_code == 404
+
+    category.is_published = True
+    category.save()
+    post.refresh_from_db()
+    assert post.is_visible
+    assert post in another_user_client.get('/').context['page_obj']
+
+
+def test_deleted_category_hides_posts(post_with_published_location):
+    post = post_with_published_location
+    post.category.delete()
+    post.refresh_from_db()
+    assert not post.is_visible
@@ -0,0 +1,109 @@
+import time
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.models import Category, Post
+from blog.query_cache import cached
+from blogicum.replicas import ReplicaMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_repeated_query_is_served_from_cache(
+        post_with_published_location, django_assert_num_queries):
+    posts = cached(Post.objects.filter(is_visible=True), 'test')
+    expected = list(posts)
+    with django_assert_num_queries(0):
+        assert list(posts.all()) == expected, (
+            'Убедитесь, что повторный запрос берётся из кэша.'
+        )
+    with django_assert_num_queries(1):
+        list(posts.filter(pk=0))
+
+
+def test_any_write_to_table_invalidates(post_with_published_location):
+    post = post_with_published_location
+    posts = cached(Post.objects.filter(pk=post.pk), 'test')
+    list(posts)
+    # UPDATE без сигналов моделей тоже меняет версию таблицы.
+    Post.objects.filter(pk=post.pk).update(title='Новый заголовок')
+    assert posts.all()[0].title == 'Новый заголовок', (
+        'Убедитесь, что запись в таблицу сбрасывает закэшированные '
+        'результаты её запросов.'
+    )
+
+
+def test_category_lookup_cached_and_invalidated(
+        user_client, published_category, post_with_published_location,
+        django_assert_max_num_queries):
+    url = f'/category/{published_category.slug}/'
+    user_client.get(url)
+    with django_assert_max_num_queries(2):
+        assert user_client.get(url).status_code == 200
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False)
+    assert user_client.get(url).status_code == 404
+
+    out = StringIO()
+    call_command('query_cache_stats', stdout=out)
+    assert 'category: попаданий 1, промахов 2' in out.getvalue()
+    assert 'category_posts: попаданий 1, промахов 1' in out.getvalue()
+
+
+@pytest.fixture
+def replica(settings):
+    """Реплика — второе соединение с той же тестовой базой."""
+    connections.settings['replica'] = {
+        **connections['default'].settings_dict,
+        'TEST': {'MIRROR': 'default'},
+    }
+    settings.DATABASE_REPLICAS = ['replica']
+    yield
+    connections['replica'].close()
+    del connections['replica']
+    del connections.settings['replica']
+
+
+def in_request(view):
+    result = []
+    ReplicaMiddleware(
+        lambda request: result.append(view()) or HttpResponse()
+    )(RequestFactory().get('/'))
+    return result[0]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_miss_after_recent_write_reads_primary(
+        replica, post_with_published_location):
+    post = post_with_published_location
+
+    def read():
+        list(cached(Post.objects.filter(pk=post.pk), 'test'))
+        return Post.objects.all().db
+
+    old = time.time_ns() - 100 * 10 ** 9
+    cache.set_many({
+        'cache_tag:all': old, 'cache_tag:table:blog_post': old,
+    }, None)
+    assert in_request(read) == 'replica'
+    Post.objects.filter(pk=post.pk).update(title='Новый заголовок')
+    assert in_request(read) == 'default', (
+        'Убедитесь, что промах по недавно изменённой таблице читается '
+        'с основной базы, а не с отстающей реплики.'
+    )
+
+
+def test_cached_user_lookup_skips_password(user_client, user):
+    user_client.get(f'/profile/{user.username}/')
+    # Значения LocMemCache хранятся сериализованными.
+    assert not any(
+        user.password.encode() in value for value in cache._cache.values()
+    ), (
+        'Убедитесь, что хэш пароля не попадает в кэш запросов.'
+    )
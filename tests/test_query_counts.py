@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from blog.models import Comment
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('disable_lazy_publication', 'disable_query_cache'),
+]
+
+# Сессия и пользователь загружаются на каждый запрос авторизованного клиента.
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def disable_lazy_publication():
+    with override_settings(PUBLICATION_SCHEDULER=True):
+        yield
+
+
+@pytest.fixture
+def disable_query_cache():
+    # Здесь считаются запросы самих страниц; попадания кэша результатов
+    # проверяет test_query_cache.
+    with override_settings(QUERY_CACHE_TIMEOUT=0):
+        yield
+
+
+@pytest.fixture
+def own_comment(user, post_with_published_location):
+    return Comment.objects.create(
+        post=post_with_published_location, author=user, text='Комментарий'
+    )
+
+
+@pytest.mark.parametrize('url, own_queries', (
+    # Публикация и списки категорий и местоположений для формы.
+    ('/posts/{post}/edit/', 3),
+    ('/posts/{post}/delete/', 1),
+    ('/posts/{post}/edit_comment/{comment}/', 1),
+    ('/posts/{post}/delete_comment/{comment}/', 1),
+))
+def test_author_gated_views_load_object_once(
+        user_client, another_user_client, post_with_published_location,
+        own_comment, django_assert_num_queries, url, own_queries):
+    url = url.format(
+        post=post_with_published_location.id, comment=own_comment.id
+    )
+    with django_assert_num_queries(AUTH_QUERIES + own_queries):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = another_user_client.get(url)
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Убедитесь, что чужая публикация или комментарий перенаправляют '
+        'на страницу публикации.'
+    )
+
+
+@pytest.mark.parametrize('url', (
+    '/profile/{user}/',
+    '/category/{category}/',
+))
+def test_feed_views_load_owner_once(
+        user, user_client, another_user_client, published_category,
+        post_with_published_location, django_assert_num_queries, url):
+    url = url.format(user=user.username, category=published_category.slug)
+    for client in (user_client, another_user_client):
+        with django_assert_num_queries(AUTH_QUERIES + 2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_comment_of_another_post_is_404(
+        user_client, own_comment, post_of_another_author):
+    response = user_client.get(
+        f'/posts/{post_of_another_author.id}/edit_comment/{own_comment.id}/'
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('hidden', (False, True))
+def test_post_detail_costs_two_queries(
+        mixer, user_client, another_user_client, post_with_published_location,
+        django_assert_num_queries, hidden):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    if hidden:
+        post.is_published = False
+        post.save()
+    url = f'/posts/{post.id}/'
+
+    # Публикация одним запросом, комментарии с авторами — вторым.
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context['comments']) == 3
+
+    with django_assert_num_queries(AUTH_QUERIES + (1 if hidden else 2)):
+        response = another_user_client.get(url)
+    assert response.status_code == (
+        HTTPStatus.NOT_FOUND if hidden else HTTPStatus.OK
+    )
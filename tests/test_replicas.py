@@ -0,0 +1,119 @@
+import sqlite3
+import time
+
+import pytest
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from blog.models import Post
+from blogicum.replicas import (
+    STICKY_COOKIE,
+    ReplicaMiddleware,
+    refresh_snapshot,
+    use_primary_if_changed,
+)
+
+with_replica = override_settings(DATABASE_REPLICAS=['replica'])
+
+
+def run_request(method='GET', cookies=None, action=None):
+    request = RequestFactory().generic(method, '/')
+    request.COOKIES.update(cookies or {})
+    seen = {}
+
+    def view(request):
+        seen['before'] = Post.objects.all().db
+        if action is not None:
+            action()
+        seen['after'] = Post.objects.all().db
+        return HttpResponse()
+
+    response = ReplicaMiddleware(view)(request)
+    return seen, response
+
+
+@with_replica
+def test_get_reads_from_replica():
+    seen, response = run_request()
+    assert seen == {'before': 'replica', 'after': 'replica'}, (
+        'Убедитесь, что чтения GET-запросов уходят на реплику.'
+    )
+    assert STICKY_COOKIE not in response.cookies
+
+
+@with_replica
+def test_reads_outside_requests_use_primary():
+    assert Post.objects.all().db == 'default'
+
+
+@with_replica
+def test_request_reads_own_writes():
+    seen, response = run_request(
+        action=lambda: router.db_for_write(Post))
+    assert seen == {'before': 'replica', 'after': 'default'}, (
+        'Убедитесь, что после записи запрос читает с основной базы.'
+    )
+    cookie = response.cookies[STICKY_COOKIE]
+    assert cookie['max-age'] == 15
+
+
+@with_replica
+@pytest.mark.parametrize('method, cookies', (
+    ('POST', {}),
+    ('GET', {STICKY_COOKIE: '1'}),
+))
+def test_writes_and_sticky_clients_use_primary(method, cookies):
+    seen, _ = run_request(method, cookies)
+    assert seen['before'] == 'default'
+
+
+@with_replica
+def test_recent_cache_tag_change_pins_primary():
+    seen, _ = run_request(
+        action=lambda: use_primary_if_changed(time.time() - 100))
+    assert seen['after'] == 'replica'
+    seen, _ = run_request(
+        action=lambda: use_primary_if_changed(time.time() - 1))
+    assert seen['after'] == 'default'
+
+
+def test_without_replicas_everything_uses_primary():
+    seen, response = run_request(action=lambda: router.db_for_write(Post))
+    assert seen == {'before': 'default', 'after': 'default'}
+    assert STICKY_COOKIE not in response.cookies
+
+
+@with_replica
+@pytest.mark.django_db(transaction=True)
+def test_freshly_invalidated_page_is_built_from_primary(
+        client, post_with_published_location):
+    # Тег страницы только что сброшен: реплика (здесь её нет вовсе)
+    # не должна использоваться, иначе запрос упал бы.
+    response = client.get('/')
+    assert response.status_code == 200
+    assert post_with_published_location in response.context['page_obj']
+
+
+def test_refresh_snapshot(tmp_path):
+    source, target = tmp_path / 'db.sqlite3', tmp_path / 'replica.sqlite3'
+    db = sqlite3.connect(source)
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('CREATE TABLE t (x)')
+    db.execute('INSERT INTO t VALUES (1)')
+    db.commit()
+    refresh_snapshot(source, target)
+    db.execute('INSERT INTO t VALUES (2)')
+    db.commit()
+
+    replica = sqlite3.connect(f'file:{target}?mode=ro', uri=True)
+    assert replica.execute('SELECT count(*) FROM t').fetchone() == (1,)
+    assert replica.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+    refresh_snapshot(source, target)
+    assert replica.execute('SELECT count(*) FROM t').fetchone() == (1,), (
+        'Открытое соединение дочитывает прежнюю копию.'
+    )
+    fresh = sqlite3.connect(f'file:{target}?mode=ro', uri=True)
+    assert fresh.execute('SELECT count(*) FROM t').fetchone() == (2,)
+    for connection in (db, replica, fresh):
+        connection.close()
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.management.commands.publish_scheduled import local_lock
+from blog.publication import publish_due_posts
+from blog.publication import posts_published
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(minutes=5),
+    )
+
+
+@pytest.fixture
+def published_events():
+    events = []
+
+    def receiver(sender, post_ids, **kwargs):
+        events.append(post_ids)
+
+    posts_published.connect(receiver)
+    yield events
+    posts_published.disconnect(receiver)
+
+
+def test_save_computes_visibility(scheduled_post, post_with_published_location):
+    assert not scheduled_post.is_visible
+    assert post_with_published_location.is_visible
+
+
+def test_due_posts_are_published_once(scheduled_post, published_events):
+    assert publish_due_posts() == []
+
+    later = timezone.now() + timedelta(minutes=10)
+    assert publish_due_posts(now=later) == [scheduled_post.id]
+    assert publish_due_posts(now=later) == []
+    assert published_events == [[scheduled_post.id]]
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.is_visible
+
+
+@override_settings(PUBLICATION_SCHEDULER=True)
+def test_feed_trusts_visibility_flag(
+        another_user_client, scheduled_post, tmp_path):
+    assert scheduled_post not in another_user_client.get('/').context[
+        'page_obj']
+    type(scheduled_post).objects.filter(pk=scheduled_post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command('publish_scheduled', lock_file=tmp_path / 'lock')
+    assert scheduled_post in another_user_client.get('/').context['page_obj']
+
+
+def test_second_scheduler_is_refused(tmp_path):
+    lock_file = tmp_path / 'lock'
+    with local_lock(lock_file):
+        with pytest.raises(CommandError):
+            call_command('publish_scheduled', lock_file=lock_file)
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+from blog.checks import check_optimizations
+from blogicum.settings.env import cache_from_url
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+PROD_SCRIPT = '''
+import sys
+import django
+django.setup()
+import blogicum.urls
+from django.core.management import call_command
+call_command('performance_report')
+print('debug_toolbar imported:', 'debug_toolbar' in sys.modules)
+'''
+
+
+def run_profile(profile, script, **env):
+    environ = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith('BLOGICUM_')
+    }
+    environ.update(
+        DJANGO_SETTINGS_MODULE='blogicum.settings',
+        BLOGICUM_PROFILE=profile,
+        **{f'BLOGICUM_{key}': value for key, value in env.items()},
+    )
+    return subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=PROJECT_DIR, env=environ, capture_output=True, text=True,
+    )
+
+
+def test_tests_use_test_profile():
+    assert settings.PROFILE == 'test', (
+        'Убедитесь, что тесты запускаются с профилем настроек test.'
+    )
+    assert 'debug_toolbar' not in settings.INSTALLED_APPS
+
+
+def test_prod_profile_enables_every_optimization(tmp_path):
+    result = run_profile(
+        'prod', PROD_SCRIPT,
+        SECRET_KEY='secret',
+        CACHE_URL=f'file://{tmp_path}',
+        MEDIA_ACCEL='x-accel-redirect',
+    )
+    assert result.returncode == 0, result.stderr
+    assert 'Профиль: prod' in result.stdout
+    assert '[выкл]' not in result.stdout, (
+        'Убедитесь, что профиль prod включает все оптимизации.'
+    )
+    assert 'debug_toolbar imported: False' in result.stdout, (
+        'Убедитесь, что в профиле prod debug_toolbar не импортируется.'
+    )
+
+
+def test_prod_profile_requires_secret_key():
+    result = run_profile('prod', 'import blogicum.settings')
+    assert result.returncode != 0
+    assert 'BLOGICUM_SECRET_KEY' in result.stderr
+
+
+def test_dev_profile_keeps_debug_toolbar():
+    result = run_profile(
+        'dev',
+        'from blogicum import settings; print(settings.INSTALLED_APPS)',
+    )
+    assert result.returncode == 0, result.stderr
+    assert 'debug_toolbar' in result.stdout
+
+
+@pytest.mark.parametrize('url, backend, location', (
+    ('locmem://', 'locmem.LocMemCache', None),
+    ('file:///var/cache/blogicum', 'filebased.FileBasedCache',
+     '/var/cache/blogicum'),
+    ('db://cache_table', 'db.DatabaseCache', 'cache_table'),
+    ('memcached://a:11211,b:11211', 'memcached.PyMemcacheCache',
+     ['a:11211', 'b:11211']),
+))
+def test_cache_from_url(url, backend, location):
+    config = cache_from_url(url)
+    assert config['BACKEND'] == f'django.core.cache.backends.{backend}'
+    assert config.get('LOCATION') == location
+
+
+def test_check_warns_about_disabled_optimizations_in_prod():
+    assert check_optimizations(None) == []
+    with override_settings(PROFILE='prod', MEDIA_ACCEL=None):
+        messages = [warning.msg for warning in check_optimizations(None)]
+    assert 'Выключено: Отдача медиа фронтовым сервером' in messages
@@ -0,0 +1,91 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connection
+
+from blog.benchmark import measure, scratch_copy
+from blogicum.backends.sqlite3.base import DatabaseWrapper, read_pragmas
+
+sqlite_only = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='PRAGMA есть только в SQLite'
+)
+
+
+def file_connection(path, **options):
+    settings_dict = {
+        **connection.settings_dict,
+        'NAME': path,
+        'OPTIONS': {**connection.settings_dict['OPTIONS'], **options},
+    }
+    return DatabaseWrapper(settings_dict, 'pragmas_test')
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_pragmas_applied_to_new_connection(tmp_path):
+    wrapper = file_connection(tmp_path / 'db.sqlite3')
+    try:
+        values = read_pragmas(wrapper)
+    finally:
+        wrapper.close()
+    assert values['journal_mode'] == 'wal', (
+        'Убедитесь, что соединения с SQLite переводятся в режим WAL.'
+    )
+    assert values['busy_timeout'] == 5000
+    assert values['synchronous'] == 1
+    assert values['temp_store'] == 2
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_immediate_transactions(tmp_path):
+    path = tmp_path / 'db.sqlite3'
+    wrapper = file_connection(path)
+    other = sqlite3.connect(path, timeout=0)
+    try:
+        wrapper.ensure_connection()
+        wrapper._start_transaction_under_autocommit()
+        with pytest.raises(sqlite3.OperationalError, match='locked'):
+            other.execute('BEGIN IMMEDIATE')
+    finally:
+        other.close()
+        wrapper.close()
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_unknown_transaction_mode(tmp_path):
+    wrapper = file_connection(tmp_path / 'db.sqlite3', transaction_mode='X')
+    with pytest.raises(ImproperlyConfigured):
+        wrapper.ensure_connection()
+
+
+@sqlite_only
+@pytest.mark.django_db
+def test_sqlite_pragmas_command():
+    out = StringIO()
+    call_command('sqlite_pragmas', stdout=out)
+    assert 'busy_timeout = 5000 (задано 5000)' in out.getvalue()
+
+
+def test_measure_counts_errors():
+    calls = iter(range(10))
+
+    def call():
+        return next(calls) % 2 == 0
+
+    result = measure(call, requests=10, threads=2)
+    assert result['requests'] == 10
+    assert result['errors'] == 5
+    assert result['p99'] >= result['p50']
+
+
+@pytest.mark.django_db
+def test_scratch_copy_needs_sqlite_file():
+    with pytest.raises(CommandError):
+        with scratch_copy(DEFAULT_DB_ALIAS):
+            pass
@@ -0,0 +1,50 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+
+CSS = 'vendor/bootstrap/css/bootstrap.min.css'
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    settings.STATIC_ROOT = tmp_path
+    call_command('collectstatic', interactive=False, verbosity=0)
+    return staticfiles_storage.stored_name(CSS)
+
+
+def test_bootstrap_is_vendored(client):
+    call_command('vendor_assets', check=True, verbosity=0)
+    content = client.get('/').content.decode()
+    assert '/static/vendor/bootstrap/css/bootstrap' in content
+    assert 'cdn.jsdelivr.net' not in content, (
+        'Убедитесь, что Bootstrap подключается из локальной статики.'
+    )
+
+
+def test_collectstatic_hashes_and_compresses(client, collected):
+    assert collected != CSS and collected.endswith('.css')
+    with staticfiles_storage.open(collected) as file:
+        original = file.read()
+    with staticfiles_storage.open(f'{collected}.gz') as file:
+        assert gzip.decompress(file.read()) == original
+    assert f'/static/{collected}' in client.get('/').content.decode()
+
+
+def test_hashed_static_is_immutable_and_precompressed(client, collected):
+    response = client.get(
+        f'/static/{collected}', HTTP_ACCEPT_ENCODING='gzip, deflate'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == 'text/css'
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response['Cache-Control']
+    assert 'Accept-Encoding' in response['Vary']
+
+    plain = client.get(f'/static/{collected}')
+    assert 'Content-Encoding' not in plain
+    assert 'immutable' not in client.get(f'/static/{CSS}')['Cache-Control']
@@ -0,0 +1,131 @@
+import threading
+
+import pytest
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import override_settings
+
+from blog.models import Comment, Location
+from blogicum.write_queue import (
+    WriteTimeout,
+    Writer,
+    run_write,
+    stop_writers,
+)
+
+
+@pytest.fixture
+def writer():
+    writer = Writer('default', size=10, batch_size=10)
+    yield writer
+    writer.stop()
+
+
+def blocked(writer):
+    """Занимает поток записи, пока не выставлен возвращённый Event."""
+    started, release = threading.Event(), threading.Event()
+
+    def wait():
+        started.set()
+        release.wait(5)
+
+    future = writer.submit(wait, timeout=1)
+    started.wait(5)
+    return release, future
+
+
+@pytest.mark.django_db(transaction=True)
+def test_writes_are_batched_in_one_transaction(writer, monkeypatch):
+    commits, transactions, committed = [], set(), []
+    commit = type(connections['default']).commit
+
+    def counting_commit(self):
+        commits.append(self.alias)
+        commit(self)
+
+    monkeypatch.setattr(
+        type(connections['default']), 'commit', counting_commit)
+    release, _ = blocked(writer)
+
+    def create(name):
+        # Между вызовами одной пачки фиксаций нет.
+        transactions.add(len(commits))
+        transaction.on_commit(lambda: committed.append(name))
+        # Без названия INSERT нарушает NOT NULL.
+        return Location.objects.create(name=name).name
+
+    futures = [
+        writer.submit(lambda name=name: create(name), timeout=1)
+        for name in ('первое', None, 'второе')
+    ]
+    release.set()
+    with pytest.raises(IntegrityError):
+        futures[1].result(5)
+    results = [futures[0].result(5), futures[2].result(5)]
+    assert [result for result, _ in results] == ['первое', 'второе']
+    assert len(transactions) == 1, (
+        'Убедитесь, что накопившиеся записи выполняются одной транзакцией.'
+    )
+    assert set(Location.objects.values_list('name', flat=True)) == {
+        'первое', 'второе'
+    }, 'Убедитесь, что ошибка одной записи не откатывает остальные.'
+    assert committed == [], (
+        'Убедитесь, что обработчики on_commit не выполняются в потоке записи.'
+    )
+    for _, hooks in results:
+        for hook in hooks:
+            hook()
+    assert committed == ['первое', 'второе']
+
+
+@pytest.mark.django_db(transaction=True)
+def test_full_queue_times_out():
+    writer = Writer('default', size=1, batch_size=1)
+    release, _ = blocked(writer)
+    writer.submit(lambda: None, timeout=1)
+    with pytest.raises(WriteTimeout):
+        writer.submit(lambda: None, timeout=0.01)
+    release.set()
+    writer.stop()
+
+
+@override_settings(WRITE_QUEUE=True)
+@pytest.mark.django_db
+def test_open_transaction_writes_in_place():
+    assert run_write(threading.get_ident) == threading.get_ident()
+
+
+@override_settings(WRITE_QUEUE=True)
+@pytest.mark.django_db(transaction=True)
+def test_comment_is_saved_by_writer(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    try:
+        response = user_client.post(
+            f'/posts/{post.id}/comment/', {'text': 'через очередь'})
+    finally:
+        stop_writers()
+    assert response.status_code == 302
+    assert Comment.objects.filter(text='через очередь').exists(), (
+        'Убедитесь, что комментарий сохраняется через очередь записи.'
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+@override_settings(WRITE_QUEUE=True)
+@pytest.mark.django_db(transaction=True)
+def test_commit_hooks_run_in_calling_thread():
+    threads = []
+
+    def create():
+        transaction.on_commit(
+            lambda: threads.append(threading.get_ident()))
+        return Location.objects.create(name='место').name
+
+    try:
+        assert run_write(create) == 'место'
+    finally:
+        stop_writers()
+    assert threads == [threading.get_ident()], (
+        'Убедитесь, что обработчики on_commit выполняет ждущий поток.'
+    )